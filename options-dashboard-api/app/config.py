@@ -11,6 +11,39 @@ class Settings(BaseSettings):
     # API Keys
     ALPHA_VANTAGE_API_KEY: Optional[str] = None
     
+    # Monte Carlo parallelism (executor: "thread" or "process")
+    MONTE_CARLO_WORKERS: int = 1
+    MONTE_CARLO_EXECUTOR: str = "thread"
+    
+    # Models of calculate_all_models run concurrently on a shared pool of this
+    # size; a model still running after its timeout is reported as timed out
+    PRICING_ENGINE_WORKERS: int = 8
+    MODEL_TIMEOUT_SECONDS: float = 30.0
+    
+    # Worker pool the routes hand pricing to (kind: "thread" or "process");
+    # requests beyond workers + queue size get 503 with Retry-After
+    PRICING_POOL_KIND: str = "thread"
+    PRICING_POOL_WORKERS: int = 4
+    PRICING_POOL_QUEUE_SIZE: int = 16
+    PRICING_POOL_RETRY_AFTER_SECONDS: int = 1
+    
+    # In-process memoization of pricing results. The TTL must be positive
+    # (None: entries never expire). Quantization rounds market inputs to this
+    # many significant digits before pricing (None: exact)
+    PRICING_CACHE_ENABLED: bool = True
+    PRICING_CACHE_MAX_ENTRIES: int = 1024
+    PRICING_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    PRICING_CACHE_TTL_SECONDS: Optional[float] = 300.0
+    PRICING_CACHE_QUANTIZE_DIGITS: Optional[int] = None
+    
+    # Shared second cache tier in Redis (REDIS_URL) behind the in-process one;
+    # off by default, enable it in deployments that run Redis. When Redis is
+    # unreachable it is bypassed for the retry interval
+    PRICING_CACHE_REDIS_ENABLED: bool = False
+    PRICING_CACHE_REDIS_TTL_SECONDS: Optional[float] = 3600.0
+    PRICING_CACHE_REDIS_TIMEOUT_SECONDS: float = 0.1
+    PRICING_CACHE_REDIS_RETRY_SECONDS: float = 30.0
+    
     # Environment
     ENVIRONMENT: str = "development"
     DEBUG: bool = True
@@ -2,6 +2,8 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.routers import options
 from app.config import settings
+from app.services.pricing_engine import pricing_engine
+from app.utils.worker_pool import worker_pool
 
 # Instantiates FastAPI app
 app = FastAPI(
@@ -34,5 +36,21 @@ async def root():
 async def health_check():
     return {
         "status": "healthy",
-        "models_available": ["black_scholes", "binomial", "monte_carlo"]
-    }
\ No newline at end of file
+        "models_available": ["black_scholes", "binomial", "monte_carlo"],
+        "worker_pool": worker_pool.metrics()
+    }
+
+# Pricing pool load (queue_depth is the signal to autoscale on), cache counters
+# and computations saved by coalescing identical in-flight requests; the
+# counters cover this process only, process-pool workers keep their own
+@app.get("/metrics")
+async def metrics():
+    return {
+        "worker_pool": worker_pool.metrics(),
+        "pricing_cache": pricing_engine.cache_stats(),
+        "coalescing": pricing_engine.coalescing_stats()
+    }
+
+@app.on_event("shutdown")
+async def shutdown_worker_pool():
+    worker_pool.shutdown()
\ No newline at end of file
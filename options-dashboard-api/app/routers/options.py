@@ -1,9 +1,13 @@
 from fastapi import APIRouter, HTTPException, BackgroundTasks
 from pydantic import BaseModel, Field, validator
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Union
 from app.services.pricing_engine import pricing_engine
 from app.services.base_model import OptionParameters
+from app.services.implied_vol import STATUS_MESSAGES, CONVERGED
+from app.services.monte_carlo import MAX_LSM_TRAINING_BYTES
+from app.utils.worker_pool import worker_pool
 import asyncio
+import numpy as np
 
 router = APIRouter()
 
@@ -20,18 +24,224 @@ class OptionRequest(BaseModel):
     # Model-specific parameters
     binomial_steps: int = Field(100, ge=10, le=1000, description="Number of binomial steps")
     monte_carlo_simulations: int = Field(10000, ge=1000, le=100000, description="MC simulations")
+    monte_carlo_seed: Optional[int] = Field(42, ge=0, description="MC seed; null for a fresh random seed")
+    monte_carlo_generator: str = Field("pcg64", description="MC bit generator: 'pcg64' or 'philox'")
+    monte_carlo_greeks: str = Field("finite_difference", description="MC Greeks: 'finite_difference' or 'pathwise'")
+    monte_carlo_antithetic: bool = Field(False, description="MC antithetic variates")
+    monte_carlo_control_variate: Optional[str] = Field(None, description="MC control variate: 'terminal_spot'")
+    monte_carlo_sampler: str = Field("pseudo", description="MC sampler: 'pseudo' or 'sobol' (randomized QMC)")
+    monte_carlo_replicates: int = Field(16, ge=2, le=256, description="Independent Sobol scrambles for the QMC error")
+    monte_carlo_target_stderr: Optional[float] = Field(None, gt=0, description="Adaptive MC: stop once the price standard error reaches this")
+    monte_carlo_max_time_ms: Optional[float] = Field(None, gt=0, le=60000, description="Adaptive MC: time budget in milliseconds")
+    monte_carlo_exercise_dates: int = Field(50, ge=1, le=5000, description="Longstaff-Schwartz exercise dates (American exercise)")
+    monte_carlo_basis: str = Field("laguerre", description="Longstaff-Schwartz basis: 'laguerre', 'monomial' or 'hermite'")
+    exercise: str = Field("european", description="'european' or 'american' (binomial tree and Monte Carlo)")
+    binomial_tree: str = Field("crr", description="Binomial lattice: 'crr', 'bbs' or 'leisen_reimer'")
+    binomial_richardson: bool = Field(False, description="Two-point Richardson extrapolation of the binomial price ('bbs' or 'leisen_reimer' tree)")
+    binomial_tolerance: Optional[float] = Field(None, gt=0, description="Target binomial price accuracy; overrides binomial_steps")
     
     @validator('option_type')
     def validate_option_type(cls, v):
         if v.lower() not in ['call', 'put']:
             raise ValueError('Option type must be "call" or "put"')
         return v.lower()
+    
+    @validator('binomial_tree')
+    def validate_binomial_tree(cls, v):
+        if v.lower() not in ['crr', 'bbs', 'leisen_reimer']:
+            raise ValueError('Binomial tree must be "crr", "bbs" or "leisen_reimer"')
+        return v.lower()
+    
+    @validator('binomial_richardson')
+    def validate_binomial_richardson(cls, v, values):
+        if v and values.get('binomial_tree') == 'crr':
+            raise ValueError('Richardson extrapolation needs the "bbs" or "leisen_reimer" binomial tree')
+        return v
+    
+    @validator('monte_carlo_generator')
+    def validate_monte_carlo_generator(cls, v):
+        if v.lower() not in ['pcg64', 'philox']:
+            raise ValueError('Monte Carlo generator must be "pcg64" or "philox"')
+        return v.lower()
+    
+    @validator('monte_carlo_greeks')
+    def validate_monte_carlo_greeks(cls, v):
+        if v.lower() not in ['finite_difference', 'pathwise']:
+            raise ValueError('Monte Carlo Greeks must be "finite_difference" or "pathwise"')
+        return v.lower()
+    
+    @validator('monte_carlo_control_variate')
+    def validate_monte_carlo_control_variate(cls, v):
+        if v is not None and v.lower() != 'terminal_spot':
+            raise ValueError('Monte Carlo control variate must be "terminal_spot" for vanilla options')
+        return v.lower() if v is not None else v
+    
+    @validator('monte_carlo_sampler')
+    def validate_monte_carlo_sampler(cls, v):
+        if v.lower() not in ['pseudo', 'sobol']:
+            raise ValueError('Monte Carlo sampler must be "pseudo" or "sobol"')
+        return v.lower()
+    
+    @validator('monte_carlo_basis')
+    def validate_monte_carlo_basis(cls, v):
+        if v.lower() not in ['laguerre', 'monomial', 'hermite']:
+            raise ValueError('Monte Carlo basis must be "laguerre", "monomial" or "hermite"')
+        return v.lower()
+    
+    @validator('exercise')
+    def validate_exercise(cls, v, values):
+        if v.lower() not in ['european', 'american']:
+            raise ValueError('Exercise must be "european" or "american"')
+        # Longstaff-Schwartz stores every training path at every exercise date
+        paths = values.get('monte_carlo_simulations', 0) * values.get('monte_carlo_exercise_dates', 0)
+        if v.lower() != 'european' and paths * 8 > MAX_LSM_TRAINING_BYTES:
+            raise ValueError(
+                f'monte_carlo_simulations x monte_carlo_exercise_dates must not exceed '
+                f'{MAX_LSM_TRAINING_BYTES // 8} for early exercise'
+            )
+        return v.lower()
+
+class ChainRequest(BaseModel):
+    symbol: str = Field(..., description="Stock symbol")
+    option_type: str = Field(..., description="'call' or 'put'")
+    spot_price: float = Field(..., gt=0, description="Current stock price")
+    strike_prices: List[float] = Field(..., min_length=1, max_length=1000, description="Strike prices to price")
+    time_to_expiry: float = Field(..., gt=0, description="Time to expiry in years")
+    risk_free_rate: float = Field(..., description="Risk-free rate as decimal")
+    dividend_yield: float = Field(0.0, ge=0, description="Dividend yield as decimal")
+    volatility: float = Field(..., gt=0, description="Volatility as decimal")
+    times_to_expiry: Optional[List[float]] = Field(None, description="Expiry per strike, overriding time_to_expiry (Monte Carlo only)")
+    model: str = Field("binomial", description="Pricing model")
+    
+    # Model-specific parameters
+    binomial_steps: int = Field(100, ge=10, le=1000, description="Number of binomial steps")
+    binomial_tree: str = Field("crr", description="Binomial lattice: 'crr', 'bbs' or 'leisen_reimer'")
+    binomial_richardson: bool = Field(False, description="Two-point Richardson extrapolation ('bbs' or 'leisen_reimer' tree)")
+    exercise: str = Field("european", description="'european' or 'american' (binomial tree only)")
+    monte_carlo_simulations: int = Field(10000, ge=1000, le=100000, description="MC simulations shared by the whole chain")
+    monte_carlo_seed: Optional[int] = Field(42, ge=0, description="MC seed; null for a fresh random seed")
+    monte_carlo_greeks: str = Field("finite_difference", description="MC Greeks: 'finite_difference' or 'pathwise'")
+    monte_carlo_antithetic: bool = Field(False, description="MC antithetic variates")
+    monte_carlo_sampler: str = Field("pseudo", description="MC sampler: 'pseudo' or 'sobol' (randomized QMC)")
+    monte_carlo_replicates: int = Field(16, ge=2, le=256, description="Independent Sobol scrambles for the QMC error")
+    
+    @validator('option_type')
+    def validate_option_type(cls, v):
+        if v.lower() not in ['call', 'put']:
+            raise ValueError('Option type must be "call" or "put"')
+        return v.lower()
+    
+    @validator('strike_prices')
+    def validate_strikes(cls, v):
+        if any(k <= 0 for k in v):
+            raise ValueError('Strike prices must be positive')
+        return v
+    
+    @validator('binomial_richardson')
+    def validate_binomial_richardson(cls, v, values):
+        if v and values.get('binomial_tree', '').lower() == 'crr':
+            raise ValueError('Richardson extrapolation needs the "bbs" or "leisen_reimer" binomial tree')
+        return v
+    
+    @validator('times_to_expiry')
+    def validate_times_to_expiry(cls, v, values):
+        if v is None:
+            return v
+        if any(t <= 0 for t in v):
+            raise ValueError('Times to expiry must be positive')
+        n = len(values.get('strike_prices') or [])
+        if n and len(v) != n:
+            raise ValueError(f'Expected {n} times to expiry to match strike_prices, got {len(v)}')
+        return v
+    
+    @validator('monte_carlo_greeks')
+    def validate_monte_carlo_greeks(cls, v):
+        if v.lower() not in ['finite_difference', 'pathwise']:
+            raise ValueError('Monte Carlo Greeks must be "finite_difference" or "pathwise"')
+        return v.lower()
+    
+    @validator('monte_carlo_sampler')
+    def validate_monte_carlo_sampler(cls, v):
+        if v.lower() not in ['pseudo', 'sobol']:
+            raise ValueError('Monte Carlo sampler must be "pseudo" or "sobol"')
+        return v.lower()
+    
+    @validator('exercise')
+    def validate_exercise(cls, v):
+        if v.lower() not in ['european', 'american']:
+            raise ValueError('Exercise must be "european" or "american"')
+        return v.lower()
+
+class PathDependentRequest(BaseModel):
+    symbol: str = Field(..., description="Stock symbol")
+    option_type: str = Field(..., description="'call' or 'put'")
+    spot_price: float = Field(..., gt=0, description="Current stock price")
+    strike_price: float = Field(..., gt=0, description="Strike price")
+    time_to_expiry: float = Field(..., gt=0, description="Time to expiry in years")
+    risk_free_rate: float = Field(..., description="Risk-free rate as decimal")
+    dividend_yield: float = Field(0.0, ge=0, description="Dividend yield as decimal")
+    volatility: float = Field(..., gt=0, description="Volatility as decimal")
+    payoffs: List[Dict[str, Any]] = Field(..., min_length=1, max_length=20,
+                                          description="Payoff specs, e.g. {'type': 'barrier', 'barrier': 120, 'direction': 'up', 'knock': 'out'}")
+    time_steps: int = Field(252, ge=1, le=5000, description="Equally spaced monitoring dates")
+    
+    # Monte Carlo parameters
+    monte_carlo_simulations: int = Field(10000, ge=1000, le=100000, description="MC simulations")
+    monte_carlo_seed: Optional[int] = Field(42, ge=0, description="MC seed; null for a fresh random seed")
+    monte_carlo_antithetic: bool = Field(False, description="MC antithetic variates")
+    monte_carlo_control_variate: Optional[str] = Field(None, description="MC control variate: 'black_scholes' or 'terminal_spot'")
+    monte_carlo_sampler: str = Field("pseudo", description="MC sampler: 'pseudo' or 'sobol' (Brownian bridge QMC)")
+    monte_carlo_replicates: int = Field(16, ge=2, le=256, description="Independent Sobol scrambles for the QMC error")
+    
+    @validator('option_type')
+    def validate_option_type(cls, v):
+        if v.lower() not in ['call', 'put']:
+            raise ValueError('Option type must be "call" or "put"')
+        return v.lower()
+    
+    @validator('monte_carlo_control_variate')
+    def validate_monte_carlo_control_variate(cls, v):
+        if v is not None and v.lower() not in ['black_scholes', 'terminal_spot']:
+            raise ValueError('Monte Carlo control variate must be "black_scholes" or "terminal_spot"')
+        return v.lower() if v is not None else v
+    
+    @validator('monte_carlo_sampler')
+    def validate_monte_carlo_sampler(cls, v):
+        if v.lower() not in ['pseudo', 'sobol']:
+            raise ValueError('Monte Carlo sampler must be "pseudo" or "sobol"')
+        return v.lower()
+
+class ImpliedVolRequest(BaseModel):
+    symbol: str = Field(..., description="Stock symbol")
+    spot_price: float = Field(..., gt=0, description="Current stock price")
+    risk_free_rate: float = Field(..., description="Risk-free rate as decimal")
+    dividend_yield: float = Field(0.0, ge=0, description="Dividend yield as decimal")
+    market_prices: List[float] = Field(..., min_length=1, description="Observed option prices")
+    strike_prices: List[float] = Field(..., min_length=1, description="Strike price per contract")
+    time_to_expiry: Union[float, List[float]] = Field(..., description="Time to expiry in years (scalar or per contract)")
+    option_type: Union[str, List[str]] = Field("call", description="'call'/'put' (scalar or per contract)")
+    
+    @validator('option_type')
+    def validate_option_type(cls, v):
+        values = [v] if isinstance(v, str) else v
+        if any(t.lower() not in ['call', 'put'] for t in values):
+            raise ValueError('Option type must be "call" or "put"')
+        return v.lower() if isinstance(v, str) else [t.lower() for t in v]
+    
+    @validator('strike_prices', 'time_to_expiry', 'option_type')
+    def validate_lengths(cls, v, values):
+        n = len(values.get('market_prices') or [])
+        if isinstance(v, list) and n and len(v) != n:
+            raise ValueError(f'Expected {n} values to match market_prices, got {len(v)}')
+        return v
 
 class PricingResponse(BaseModel):
     symbol: str
     results: List[Dict[str, Any]]
     summary: Dict[str, Any]
     validation_errors: List[str] = []
+    model_errors: List[Dict[str, Any]] = []
+    partial: bool = False
 
 @router.post("/price", response_model=PricingResponse)
 async def calculate_option_price(request: OptionRequest):
@@ -59,10 +269,29 @@ async def calculate_option_price(request: OptionRequest):
             )
         
         # Calculate using all models
-        pricing_results = pricing_engine.calculate_all_models(
+        pricing_results, failures = await worker_pool.run_engine("calculate_all_models",
             params,
             binomial_steps=request.binomial_steps,
-            monte_carlo_simulations=request.monte_carlo_simulations
+            monte_carlo_simulations=request.monte_carlo_simulations,
+            exercise=request.exercise,
+            binomial_options={
+                "tree": request.binomial_tree,
+                "richardson": request.binomial_richardson,
+                "tolerance": request.binomial_tolerance
+            },
+            monte_carlo_options={
+                "seed": request.monte_carlo_seed,
+                "bit_generator": request.monte_carlo_generator,
+                "greeks_method": request.monte_carlo_greeks,
+                "antithetic": request.monte_carlo_antithetic,
+                "control_variate": request.monte_carlo_control_variate,
+                "sampler": request.monte_carlo_sampler,
+                "replicates": request.monte_carlo_replicates,
+                "target_stderr": request.monte_carlo_target_stderr,
+                "max_time_ms": request.monte_carlo_max_time_ms,
+                "exercise_dates": request.monte_carlo_exercise_dates,
+                "basis": request.monte_carlo_basis
+            }
         )
         
         # Format results for API response
@@ -79,6 +308,21 @@ async def calculate_option_price(request: OptionRequest):
             if result.parameters:
                 formatted_result["parameters"] = result.parameters
             
+            if result.exercise_boundary:
+                formatted_result["exercise_boundary"] = result.exercise_boundary
+            
+            if result.standard_error is not None:
+                formatted_result["standard_error"] = round(result.standard_error, 6)
+                formatted_result["variance_reduction_factor"] = (
+                    round(result.variance_reduction_factor, 2)
+                    if result.variance_reduction_factor is not None else None
+                )
+            
+            if result.greek_standard_errors:
+                formatted_result["greek_standard_errors"] = {
+                    k: round(v, 6) for k, v in result.greek_standard_errors.items()
+                }
+            
             formatted_results.append(formatted_result)
         
         # Calculate summary statistics
@@ -87,9 +331,16 @@ async def calculate_option_price(request: OptionRequest):
         return PricingResponse(
             symbol=request.symbol,
             results=formatted_results,
-            summary=summary
+            summary=summary,
+            model_errors=[
+                {"model": f.model_name, "error": f.error, "timed_out": f.timed_out}
+                for f in failures
+            ],
+            partial=bool(failures)
         )
-        
+    
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Calculation error: {str(e)}")
 
@@ -103,9 +354,21 @@ async def calculate_greeks(
     volatility: float,
     option_type: str = "call",
     dividend_yield: float = 0.0,
-    model: str = "black_scholes"
+    model: str = "black_scholes",
+    greeks: Optional[str] = None,
+    exercise: str = "european",
+    greeks_method: Optional[str] = None
 ):
-    """Calculate option Greeks using specified model"""
+    """Calculate option Greeks using specified model
+    
+    `greeks` is an optional comma-separated list (e.g. "delta,vanna,charm")
+    selecting which Greeks to compute; models that only support the default
+    first-order set ignore it. `greeks_method` selects the estimator for the
+    binomial ("tree", "finite_difference") and Monte Carlo
+    ("finite_difference", "pathwise") models. Early exercise is priced by
+    the binomial tree (with tree Greeks) or by Longstaff-Schwartz Monte
+    Carlo (price only).
+    """
     try:
         params = OptionParameters(
             spot_price=spot_price,
@@ -123,21 +386,196 @@ async def calculate_greeks(
             raise HTTPException(status_code=400, detail=f"Parameter validation failed: {validation_errors}")
         
         # Calculate using specified model
-        result = pricing_engine.calculate_single_model(model, params)
+        greek_mask = [g.strip() for g in greeks.split(",") if g.strip()] if greeks else None
+        method_kwargs = {"greeks_method": greeks_method} if greeks_method else {}
+        if exercise.lower() != "european":
+            if model not in ("binomial", "monte_carlo"):
+                raise ValueError(f"Exercise '{exercise}' is supported by the binomial and Monte Carlo models")
+            result = await worker_pool.run_engine("calculate_single_model",
+                model, params, exercise=exercise.lower(), **method_kwargs
+            )
+        else:
+            result = await worker_pool.run_engine("calculate_single_model", model, params, greeks=greek_mask, **method_kwargs)
         
-        return {
+        response = {
             "symbol": symbol,
             "model": result.model_name,
             "greeks": result.greeks,
             "price": round(result.price, 6),
             "computation_time": round(result.computation_time * 1000, 2)
         }
-        
+        if result.exercise_boundary:
+            response["exercise_boundary"] = result.exercise_boundary
+        if result.standard_error is not None:
+            response["standard_error"] = result.standard_error
+        if result.greek_standard_errors:
+            response["greek_standard_errors"] = result.greek_standard_errors
+        return response
+    
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Calculation error: {str(e)}")
 
+@router.post("/chain")
+async def calculate_option_chain(request: ChainRequest):
+    """Price a strike chain for one underlying in a single call (Monte Carlo also takes an expiry per strike)"""
+    try:
+        params = OptionParameters(
+            spot_price=request.spot_price,
+            strike_price=request.strike_prices[0],
+            time_to_expiry=request.time_to_expiry,
+            risk_free_rate=request.risk_free_rate,
+            volatility=request.volatility,
+            dividend_yield=request.dividend_yield,
+            option_type=request.option_type
+        )
+        
+        validation_errors = pricing_engine.validate_parameters(params)
+        if validation_errors:
+            raise HTTPException(status_code=400, detail=f"Parameter validation failed: {validation_errors}")
+        
+        model_kwargs = {}
+        if request.model == "binomial":
+            model_kwargs = {
+                "steps": request.binomial_steps,
+                "exercise": request.exercise,
+                "tree": request.binomial_tree,
+                "richardson": request.binomial_richardson
+            }
+        elif request.model == "monte_carlo":
+            model_kwargs = {
+                "expiries": request.times_to_expiry,
+                "simulations": request.monte_carlo_simulations,
+                "seed": request.monte_carlo_seed,
+                "greeks_method": request.monte_carlo_greeks,
+                "antithetic": request.monte_carlo_antithetic,
+                "sampler": request.monte_carlo_sampler,
+                "replicates": request.monte_carlo_replicates
+            }
+        if request.exercise != "european" and request.model != "binomial":
+            raise ValueError(f"Early-exercise chains are priced by the binomial model only; "
+                             f"price single {request.exercise} contracts with Monte Carlo via /price")
+        if request.times_to_expiry is not None and request.model != "monte_carlo":
+            raise ValueError("Per-strike expiries are only supported by the Monte Carlo model")
+        
+        chain = await worker_pool.run_engine("calculate_chain", request.model, params, request.strike_prices, **model_kwargs)
+        
+        response = {
+            "symbol": request.symbol,
+            "model": request.model,
+            "strike_prices": request.strike_prices,
+            "prices": np.round(chain["price"], 6).tolist(),
+            "greeks": {
+                greek: np.round(chain[greek], 6).tolist()
+                for greek in ("delta", "gamma", "theta", "vega", "rho") if greek in chain
+            },
+            "computation_time": round(chain["computation_time"] * 1000, 2)
+        }
+        if "exercise_boundary" in chain:
+            response["exercise_boundary"] = chain["exercise_boundary"]
+        if "standard_error" in chain:
+            response["times_to_expiry"] = chain["expiries"].tolist()
+            response["standard_errors"] = np.round(chain["standard_error"], 6).tolist()
+            response["greek_standard_errors"] = {
+                greek: np.round(errors, 6).tolist() for greek, errors in chain["greek_standard_errors"].items()
+            }
+            response["parameters"] = chain["parameters"]
+        return response
+    
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Chain calculation error: {str(e)}")
+
+@router.post("/path-dependent")
+async def calculate_path_dependent(request: PathDependentRequest):
+    """Price Asian, barrier and lookback payoffs from one shared Monte Carlo simulation"""
+    try:
+        params = OptionParameters(
+            spot_price=request.spot_price,
+            strike_price=request.strike_price,
+            time_to_expiry=request.time_to_expiry,
+            risk_free_rate=request.risk_free_rate,
+            volatility=request.volatility,
+            dividend_yield=request.dividend_yield,
+            option_type=request.option_type
+        )
+        
+        validation_errors = pricing_engine.validate_parameters(params)
+        if validation_errors:
+            raise HTTPException(status_code=400, detail=f"Parameter validation failed: {validation_errors}")
+        
+        result = await worker_pool.run_engine("calculate_path_dependent",
+            params,
+            request.payoffs,
+            time_steps=request.time_steps,
+            simulations=request.monte_carlo_simulations,
+            seed=request.monte_carlo_seed,
+            antithetic=request.monte_carlo_antithetic,
+            control_variate=request.monte_carlo_control_variate,
+            sampler=request.monte_carlo_sampler,
+            replicates=request.monte_carlo_replicates
+        )
+        
+        return {
+            "symbol": request.symbol,
+            "payoffs": {
+                name: {
+                    "price": round(estimate["price"], 6),
+                    "standard_error": round(estimate["standard_error"], 6),
+                    "variance_reduction_factor": (round(estimate["variance_reduction_factor"], 2)
+                                                  if estimate["variance_reduction_factor"] is not None else None)
+                }
+                for name, estimate in result["payoffs"].items()
+            },
+            "parameters": result["parameters"],
+            "computation_time": round(result["computation_time"] * 1000, 2)
+        }
+    
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Path-dependent calculation error: {str(e)}")
+
+@router.post("/implied-vol")
+async def calculate_implied_volatility(request: ImpliedVolRequest):
+    """Invert a chain of market prices to Black-Scholes implied volatilities"""
+    try:
+        solution = await worker_pool.run_engine("calculate_implied_volatility",
+            market_price=request.market_prices,
+            spot_price=request.spot_price,
+            strike_price=request.strike_prices,
+            time_to_expiry=request.time_to_expiry,
+            risk_free_rate=request.risk_free_rate,
+            dividend_yield=request.dividend_yield,
+            option_type=request.option_type
+        )
+        
+        statuses = solution["status"].tolist()
+        return {
+            "symbol": request.symbol,
+            "implied_volatilities": [
+                round(float(v), 8) if status == CONVERGED else None
+                for v, status in zip(solution["implied_volatility"], statuses)
+            ],
+            "status": [STATUS_MESSAGES[status] for status in statuses],
+            "iterations": solution["iterations"].tolist(),
+            "converged": sum(status == CONVERGED for status in statuses),
+            "failed": sum(status != CONVERGED for status in statuses)
+        }
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Implied volatility error: {str(e)}")
+
 @router.post("/heatmap")
 async def generate_heatmap(
     request: OptionRequest,
@@ -164,7 +602,6 @@ async def generate_heatmap(
             raise HTTPException(status_code=400, detail=f"Parameter validation failed: {validation_errors}")
         
         # Generate ranges
-        import numpy as np
         spot_prices = np.linspace(
             request.spot_price * spot_range[0],
             request.spot_price * spot_range[1],
@@ -173,35 +610,21 @@ async def generate_heatmap(
         
         times = np.linspace(time_range[0], time_range[1], grid_size)
         
-        # Calculate price matrix
-        price_matrix = []
-        delta_matrix = []
-        gamma_matrix = []
+        # Price the whole grid as one batch (rows are times, columns are spots)
+        batch = await worker_pool.run_engine("calculate_batch",
+            model,
+            spot_price=spot_prices[np.newaxis, :],
+            strike_price=base_params.strike_price,
+            time_to_expiry=times[:, np.newaxis],
+            risk_free_rate=base_params.risk_free_rate,
+            volatility=base_params.volatility,
+            dividend_yield=base_params.dividend_yield,
+            option_type=base_params.option_type
+        )
         
-        for t in times:
-            price_row = []
-            delta_row = []
-            gamma_row = []
-            
-            for s in spot_prices:
-                params = OptionParameters(
-                    spot_price=s,
-                    strike_price=base_params.strike_price,
-                    time_to_expiry=t,
-                    risk_free_rate=base_params.risk_free_rate,
-                    dividend_yield=base_params.dividend_yield,
-                    volatility=base_params.volatility,
-                    option_type=base_params.option_type
-                )
-                
-                result = pricing_engine.calculate_single_model(model, params)
-                price_row.append(round(result.price, 6))
-                delta_row.append(round(result.greeks.get("delta", 0), 6))
-                gamma_row.append(round(result.greeks.get("gamma", 0), 6))
-            
-            price_matrix.append(price_row)
-            delta_matrix.append(delta_row)
-            gamma_matrix.append(gamma_row)
+        price_matrix = np.round(batch["price"], 6).tolist()
+        delta_matrix = np.round(batch["delta"], 6).tolist()
+        gamma_matrix = np.round(batch["gamma"], 6).tolist()
         
         return {
             "symbol": request.symbol,
@@ -218,7 +641,9 @@ async def generate_heatmap(
                 "option_type": request.option_type
             }
         }
-        
+    
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Heatmap generation error: {str(e)}")
 
@@ -243,7 +668,9 @@ async def get_available_models():
                 "name": "monte_carlo",
                 "display_name": "Monte Carlo",
                 "description": "Stochastic simulation",
-                "parameters": ["simulations"]
+                "parameters": ["simulations", "seed", "bit_generator", "greeks_method",
+                               "antithetic", "control_variate", "sampler", "replicates",
+                               "target_stderr", "max_time_ms", "exercise", "exercise_dates", "basis"]
             }
         ]
     }
\ No newline at end of file
@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 import time
 
 @dataclass
@@ -9,8 +9,8 @@ class OptionParameters:
     strike_price: float
     time_to_expiry: float  # in years
     risk_free_rate: float
-    dividend_yield: float = 0.0
     volatility: float
+    dividend_yield: float = 0.0
     option_type: str = "call"  # "call" or "put"
 
 @dataclass
@@ -20,6 +20,16 @@ class PricingResult:
     model_name: str
     greeks: Dict[str, float] = None
     parameters: Dict[str, Any] = None
+    exercise_boundary: Dict[str, List[Optional[float]]] = None
+    greek_standard_errors: Dict[str, float] = None
+    standard_error: Optional[float] = None
+    variance_reduction_factor: Optional[float] = None
+
+@dataclass
+class ModelFailure:
+    model_name: str
+    error: str
+    timed_out: bool = False
 
 class BasePricingModel(ABC):
     """Abstract base class for all pricing models"""
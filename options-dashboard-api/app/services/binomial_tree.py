@@ -1,78 +1,540 @@
 import numpy as np
 import math
-from typing import Dict
+from typing import Dict, List, Optional
 from .base_model import BasePricingModel, OptionParameters, PricingResult
+from .black_scholes import BlackScholesModel
+
+EXERCISE_STYLES = ("european", "american")
+
+# Lattice variants and their convergence order in the number of steps (used
+# for Richardson extrapolation). "bbs" is a CRR lattice whose last step is
+# replaced by the Black-Scholes formula; with Richardson it is BBSR.
+TREE_TYPES = {"crr": 1, "bbs": 1, "leisen_reimer": 2}
+
+# Lattices whose error is smooth enough in N to extrapolate; the plain CRR
+# price oscillates with N, and extrapolating it often makes the error worse
+RICHARDSON_TREES = ("bbs", "leisen_reimer")
+
+MAX_STEPS = 1000
+
+
+class _EarlyExercise:
+    """Applies the American exercise decision during backward induction
+    
+    Tracks the stock prices of the current lattice level (rolled back one
+    level per step by dividing by u) and replaces continuation values with
+    the intrinsic value wherever exercising is worth more. When `record` is
+    set, the critical stock price of each level is collected: the highest
+    exercised node for puts, the lowest for calls (NaN where no node is
+    exercised). `strike` may be a column of strikes for chain pricing.
+    """
+    
+    def __init__(self, stock_prices: np.ndarray, u, strike, phi: float, record: bool = False):
+        self.stock_prices = stock_prices
+        self.u = u
+        self.strike = strike
+        self.phi = phi
+        self.record = record
+        self.boundary: List[np.ndarray] = []
+    
+    def apply(self, option_values: np.ndarray) -> np.ndarray:
+        """Step the stock prices back one level, then exercise"""
+        self.stock_prices = self.stock_prices[..., :-1] / self.u
+        return self.exercise(option_values)
+    
+    def exercise(self, option_values: np.ndarray) -> np.ndarray:
+        """Exercise at the current level"""
+        intrinsic = np.maximum(self.phi * (self.stock_prices - self.strike), 0.0)
+        
+        if self.record:
+            exercised = (intrinsic > 0) & (intrinsic >= option_values)
+            if self.phi > 0:
+                critical = np.min(np.where(exercised, self.stock_prices, np.inf), axis=-1)
+            else:
+                critical = np.max(np.where(exercised, self.stock_prices, -np.inf), axis=-1)
+            self.boundary.append(np.where(np.isfinite(critical), critical, np.nan))
+        
+        return np.maximum(option_values, intrinsic)
+
 
 class BinomialTreeModel(BasePricingModel):
+
+    def __init__(self):
+        self._black_scholes = BlackScholesModel()
     
-    def calculate(self, params: OptionParameters, steps: int = 100, **kwargs) -> PricingResult:
-        """Calculate binomial tree option price and Greeks"""
-        price, computation_time = self._time_calculation(
-            self._calculate_price, params, steps
-        )
+    def calculate(self, params: OptionParameters, steps: int = 100,
+                  greeks_method: str = "tree", exercise: str = "european",
+                  tree: str = "crr", richardson: bool = False,
+                  tolerance: Optional[float] = None, **kwargs) -> PricingResult:
+        """Calculate binomial tree option price and Greeks
+        
+        With greeks_method="tree" the price, delta, gamma and theta all come
+        from one extended lattice, so the timing covers price and Greeks.
+        With exercise="american" the result also carries the early-exercise
+        boundary recorded while pricing.
+        
+        `tree` selects the lattice ("crr", "bbs" or "leisen_reimer") and
+        `richardson` enables two-point extrapolation between `steps` and
+        roughly steps/2 (BBS and Leisen-Reimer only). When `tolerance` is
+        given, `steps` is ignored and the cheapest step count whose estimated
+        price error is within tolerance is used instead, capped at MAX_STEPS;
+        parameters["tolerance_met"] is False when even MAX_STEPS misses it.
+        The reported price and error estimate both come from that search.
+        """
+        self._validate_exercise(exercise)
+        self._validate_tree(tree, richardson)
+        
+        def _price_and_greeks():
+            n, searched_price, error_estimate, tolerance_met = steps, None, None, None
+            if tolerance is not None:
+                n, searched_price, error_estimate, tolerance_met = self._steps_for_tolerance(
+                    params, tolerance, exercise, tree, richardson
+                )
+            n = self._normalize_steps(n, tree)
+            
+            if greeks_method == "tree":
+                price, greeks, boundary = self._calculate_price_and_tree_greeks(
+                    params, n, exercise, tree, richardson
+                )
+            else:
+                if searched_price is not None and exercise == "european":
+                    price, boundary = searched_price, None
+                else:
+                    price, boundary = self._calculate_price_and_boundary(params, n, exercise, tree, richardson)
+                greeks = self.calculate_greeks(
+                    params, steps=n, greeks_method=greeks_method,
+                    exercise=exercise, tree=tree, richardson=richardson
+                )
+            # The lattice runs above agree with the search to rounding; report the searched price
+            if searched_price is not None:
+                price = searched_price
+            return price, greeks, boundary, n, error_estimate, tolerance_met
+        
+        (price, greeks, boundary, n, error_estimate, tolerance_met), computation_time = \
+            self._time_calculation(_price_and_greeks)
         
-        # Calculate Greeks using finite differences
-        greeks = self.calculate_greeks(params, steps=steps)
+        parameters = {
+            "steps": n,
+            "greeks_method": greeks_method,
+            "exercise": exercise,
+            "tree": tree,
+            "richardson": richardson
+        }
+        if tolerance is not None:
+            parameters["tolerance"] = tolerance
+            parameters["error_estimate"] = error_estimate
+            parameters["tolerance_met"] = tolerance_met
         
         return PricingResult(
             price=price,
             computation_time=computation_time,
             model_name="Binomial Tree",
             greeks=greeks,
-            parameters={"steps": steps}
+            parameters=parameters,
+            exercise_boundary=boundary
         )
     
-    def calculate_greeks(self, params: OptionParameters, steps: int = 100, **kwargs) -> Dict[str, float]:
-        """Calculate Greeks using finite differences"""
-        return self._calculate_greeks_finite_diff(params, steps)
+    def calculate_greeks(self, params: OptionParameters, steps: int = 100,
+                         greeks_method: str = "tree", exercise: str = "european",
+                         tree: str = "crr", richardson: bool = False, **kwargs) -> Dict[str, float]:
+        """Calculate Greeks from the lattice ("tree") or by full repricing ("finite_difference")"""
+        self._validate_exercise(exercise)
+        self._validate_tree(tree, richardson)
+        steps = self._normalize_steps(steps, tree)
+        
+        if greeks_method == "tree":
+            _, greeks, _ = self._calculate_price_and_tree_greeks(params, steps, exercise, tree, richardson)
+            return greeks
+        if greeks_method == "finite_difference":
+            return self._calculate_greeks_finite_diff(params, steps, exercise, tree, richardson)
+        raise ValueError(f"Unknown Greeks method: {greeks_method}")
+    
+    def calculate_chain(self, params: OptionParameters, strikes, steps: int = 100,
+                        exercise: str = "european", tree: str = "crr",
+                        richardson: bool = False, **kwargs) -> Dict[str, np.ndarray]:
+        """Price a whole strike vector on one shared lattice
+        
+        `params` supplies spot, volatility, rates, expiry and option type; its
+        strike is ignored in favour of `strikes`. Returns arrays of prices and
+        tree Greeks aligned with `strikes`, plus the early-exercise boundary
+        per strike for American exercise.
+        
+        CRR and BBS lattices are shared by all strikes; Leisen-Reimer
+        parameters depend on the strike, so each strike gets its own row of
+        lattice parameters but the rollback is still one array operation.
+        """
+        self._validate_exercise(exercise)
+        self._validate_tree(tree, richardson)
+        steps = self._normalize_steps(steps, tree)
+        strikes = np.atleast_1d(np.asarray(strikes, dtype=np.float64))
+        
+        (prices, greeks, boundary), computation_time = self._time_calculation(
+            self._calculate_strikes_with_richardson, params, strikes, steps, exercise, tree, richardson
+        )
+        
+        chain = {"price": prices, **greeks, "computation_time": computation_time}
+        if boundary is not None:
+            chain["exercise_boundary"] = [
+                self._format_boundary(params, steps, boundary[:, i], float(strike))
+                for i, strike in enumerate(strikes)
+            ]
+        return chain
+    
+    def _validate_exercise(self, exercise: str):
+        if exercise not in EXERCISE_STYLES:
+            raise ValueError(f"Exercise must be one of {EXERCISE_STYLES}, got '{exercise}'")
+    
+    def _validate_tree(self, tree: str, richardson: bool = False):
+        if tree not in TREE_TYPES:
+            raise ValueError(f"Tree must be one of {tuple(TREE_TYPES)}, got '{tree}'")
+        if richardson and tree not in RICHARDSON_TREES:
+            raise ValueError(f"Richardson extrapolation needs one of the {RICHARDSON_TREES} trees, got '{tree}'")
+    
+    def _normalize_steps(self, steps: int, tree: str) -> int:
+        """Leisen-Reimer is defined for an odd number of steps"""
+        if tree == "leisen_reimer" and steps % 2 == 0:
+            return steps + 1
+        return steps
+    
+    def _coarse_steps(self, steps: int, tree: str) -> int:
+        """Step count of the coarse tree used for Richardson extrapolation"""
+        return self._normalize_steps(max(steps // 2, 2), tree)
+    
+    def _richardson(self, fine, coarse, steps: int, coarse_steps: int, tree: str):
+        """Two-point Richardson extrapolation, applied leaf-wise to dicts"""
+        if isinstance(fine, dict):
+            return {key: self._richardson(fine[key], coarse[key], steps, coarse_steps, tree) for key in fine}
+        
+        order = TREE_TYPES[tree]
+        weight = steps ** order / (steps ** order - coarse_steps ** order)
+        return weight * fine - (weight - 1) * coarse
     
-    def _calculate_price(self, params: OptionParameters, steps: int) -> float:
+    def _steps_for_tolerance(self, params: OptionParameters, tolerance: float, exercise: str,
+                             tree: str, richardson: bool):
+        """Smallest step count whose estimated price error is within `tolerance`
+        
+        The step counts form a ladder down from MAX_STEPS by _coarse_steps
+        (about 15, 31, 62, ... 1000), so with Richardson enabled each rung's
+        coarse tree is exactly the previous rung and the search's estimate
+        is the price calculate reports. The error of each estimate is taken
+        as the larger of its last two successive changes, which guards
+        against the odd lucky agreement of an oscillating tree.
+        
+        That estimate is conservative for BBS with Richardson: the
+        extrapolated BBS price does not converge monotonically along the
+        ladder, so successive changes can exceed its true error by orders of
+        magnitude and the search may run to MAX_STEPS with tolerance_met
+        False although the price is already well within tolerance.
+        
+        Returns (steps, price, error_estimate, tolerance_met); when no step
+        count meets the tolerance, MAX_STEPS is returned with tolerance_met
+        False.
+        """
+        candidates = [MAX_STEPS - 1 if tree == "leisen_reimer" else MAX_STEPS]
+        while self._coarse_steps(candidates[0], tree) >= 10:
+            candidates.insert(0, self._coarse_steps(candidates[0], tree))
+        
+        previous_plain = None
+        previous_estimate = None
+        previous_steps = None
+        previous_change = math.inf
+        error_estimate = math.inf
+        for n in candidates:
+            plain = self._calculate_price(params, n, exercise, tree)
+            estimate = plain
+            if richardson and previous_plain is not None:
+                estimate = self._richardson(plain, previous_plain, n, previous_steps, tree)
+            
+            if previous_estimate is not None:
+                change = abs(estimate - previous_estimate)
+                error_estimate = max(change, previous_change)
+                if error_estimate <= tolerance:
+                    return n, float(estimate), error_estimate, True
+                previous_change = change
+            
+            previous_plain, previous_estimate, previous_steps = plain, estimate, n
+        
+        return candidates[-1], float(previous_estimate), error_estimate, False
+    
+    def _calculate_price(self, params: OptionParameters, steps: int, exercise: str = "european",
+                         tree: str = "crr", richardson: bool = False) -> float:
         """Calculate option price using binomial tree"""
+        price, _ = self._calculate_price_and_boundary(params, steps, exercise, tree, richardson, record=False)
+        return price
+    
+    def _calculate_price_and_boundary(self, params: OptionParameters, steps: int, exercise: str,
+                                      tree: str = "crr", richardson: bool = False, record: bool = True):
+        """Price plus the early-exercise boundary (None for European exercise)
+        
+        Only the current time slice of the lattice is kept: terminal prices
+        come from one vectorized power and each backward step collapses the
+        value vector by one node, so memory is O(steps).
+        """
+        steps = self._normalize_steps(steps, tree)
+        u, d, p, discount = self._lattice_parameters(params, steps, tree)
+        option_values, early_exercise = self._roll_back(
+            params, None, params.spot_price, u, d, p, discount,
+            levels=steps, stop_level=0, steps=steps, tree=tree, exercise=exercise, record=record
+        )
+        price = float(option_values[0])
+        
+        if richardson:
+            coarse_steps = self._coarse_steps(steps, tree)
+            coarse_price = self._calculate_price(params, coarse_steps, exercise, tree)
+            price = float(self._richardson(price, coarse_price, steps, coarse_steps, tree))
+        
+        boundary = None
+        if early_exercise is not None and record:
+            boundary = self._format_boundary(params, steps, np.array(early_exercise.boundary), params.strike_price)
+        return price, boundary
+    
+    def _calculate_price_and_tree_greeks(self, params: OptionParameters, steps: int, exercise: str = "european",
+                                         tree: str = "crr", richardson: bool = False):
+        """Single-contract wrapper around the shared-lattice tree Greeks"""
+        prices, greeks, boundary = self._calculate_strikes_with_richardson(
+            params, np.array([params.strike_price]), steps, exercise, tree, richardson
+        )
+        
+        greeks = {name: float(values[0]) for name, values in greeks.items()}
+        if boundary is not None:
+            boundary = self._format_boundary(params, steps, boundary[:, 0], params.strike_price)
+        return float(prices[0]), greeks, boundary
+    
+    def _calculate_strikes_with_richardson(self, params: OptionParameters, strikes: np.ndarray, steps: int,
+                                           exercise: str, tree: str, richardson: bool):
+        """Tree prices and Greeks, optionally extrapolated from a coarse tree
+        
+        Price and Greeks are linear in the lattice values, so the same
+        Richardson weights apply to all of them. The boundary comes from the
+        fine tree.
+        """
+        prices, greeks, boundary = self._calculate_strikes_and_tree_greeks(params, strikes, steps, exercise, tree)
+        if not richardson:
+            return prices, greeks, boundary
+        
+        coarse_steps = self._coarse_steps(steps, tree)
+        coarse_prices, coarse_greeks, _ = self._calculate_strikes_and_tree_greeks(
+            params, strikes, coarse_steps, exercise, tree
+        )
+        prices = self._richardson(prices, coarse_prices, steps, coarse_steps, tree)
+        greeks = self._richardson(greeks, coarse_greeks, steps, coarse_steps, tree)
+        return prices, greeks, boundary
+    
+    def _calculate_strikes_and_tree_greeks(self, params: OptionParameters, strikes: np.ndarray,
+                                           steps: int, exercise: str = "european", tree: str = "crr"):
+        """Prices and Greeks for a vector of strikes from one set of lattices
+        
+        The stock-price lattice only depends on spot, volatility, expiry and
+        steps, so every strike is rolled back together as one row of a
+        (strikes x nodes) value array.
+        
+        Price, delta, gamma and theta come from one lattice extended two steps
+        back in time (root at t = -2*dt): the three nodes at step 2 straddle
+        today's spot (S*u/d, S, S*d/u) and give the price and centred
+        delta/gamma, and the root gives the value with two extra steps to
+        expiry for theta. Vega and rho come from the two bumped lattices,
+        rolled back together as a leading axis of the same array.
+        
+        Returns prices, a dict of Greek arrays and, for American exercise,
+        the early-exercise boundary as a (steps x strikes) array.
+        """
+        S = params.spot_price
+        steps = self._normalize_steps(steps, tree)
+        strikes = np.asarray(strikes, dtype=np.float64)[:, np.newaxis]
+        u, d, p, discount = self._lattice_parameters(params, steps, tree, strikes)
+        dt = params.time_to_expiry / steps
+        
+        # Extended lattice rooted so that the middle node at step 2 is today's spot
+        # (for CRR u*d = 1 and the root is the spot itself)
+        root_spot = S / (u * d)
+        option_values, early_exercise = self._roll_back(
+            params, strikes, root_spot, u, d, p, discount,
+            levels=steps + 2, stop_level=2, steps=steps, tree=tree, exercise=exercise, record=True
+        )
+        v_up, price, v_down = option_values[:, 0], option_values[:, 1], option_values[:, 2]
+        
+        boundary = None
+        if early_exercise is not None:
+            boundary = np.array(early_exercise.boundary)
+            early_exercise.record = False
+        root_value = self._backward_induction(option_values, 2, p, discount, early_exercise)[:, 0]
+        
+        s_up = np.ravel(S * u / d)
+        s_down = np.ravel(S * d / u)
+        delta = (v_up - v_down) / (s_up - s_down)
+        gamma = ((v_up - price) / (s_up - S) - (price - v_down) / (S - s_down)) / (0.5 * (s_up - s_down))
+        
+        # Value today with two extra steps to expiry, shifted back to today's spot
+        root_shift = S - np.ravel(root_spot)
+        root_value = root_value + delta * root_shift + 0.5 * gamma * root_shift ** 2
+        theta = (price - root_value) / (2 * dt) / 365  # Per day
+        
+        # Vega and rho: both bumped lattices rolled back together along a leading axis
+        dv = 0.01
+        dr = 0.01
+        params_vega = OptionParameters(**params.__dict__)
+        params_vega.volatility += dv
+        params_rho = OptionParameters(**params.__dict__)
+        params_rho.risk_free_rate += dr
+        
+        bumped = [self._lattice_parameters(bumped_params, steps, tree, strikes)
+                  for bumped_params in (params_vega, params_rho)]
+        u_b, d_b, p_b, discount_b = (self._stack_rows(values) for values in zip(*bumped))
+        rates_b = self._stack_rows([params.risk_free_rate, params_rho.risk_free_rate])
+        vols_b = self._stack_rows([params_vega.volatility, params.volatility])
+        
+        bumped_values, _ = self._roll_back(
+            params, strikes, S, u_b, d_b, p_b, discount_b,
+            levels=steps, stop_level=0, steps=steps, tree=tree, exercise=exercise,
+            rates=rates_b, vols=vols_b
+        )
+        price_vega, price_rho = bumped_values[:, :, 0]
+        
+        greeks = {
+            "delta": delta,
+            "gamma": gamma,
+            "theta": theta,
+            "vega": price_vega - price,  # Per 1% volatility change
+            "rho": price_rho - price  # Per 1% rate change
+        }
+        return price, greeks, boundary
+    
+    def _stack_rows(self, values) -> np.ndarray:
+        """Stack per-lattice parameters along a new leading axis, as (lattices, strikes, 1)"""
+        stacked = np.stack(np.broadcast_arrays(*[np.asarray(v, dtype=np.float64) for v in values]))
+        return stacked.reshape(stacked.shape + (1,) * (3 - stacked.ndim))
+    
+    def _lattice_parameters(self, params: OptionParameters, steps: int, tree: str = "crr", strikes=None):
+        """Up/down factors, risk-neutral probability and per-step discount
+        
+        CRR (also used by "bbs") returns scalars. Leisen-Reimer depends on
+        the strike, so with a column of `strikes` it returns matching arrays.
+        """
+        dt = params.time_to_expiry / steps
+        discount = math.exp(-params.risk_free_rate * dt)
+        
+        if tree == "leisen_reimer":
+            return self._leisen_reimer_parameters(params, steps, strikes) + (discount,)
+        
+        u = math.exp(params.volatility * math.sqrt(dt))  # Up factor
+        d = 1 / u  # Down factor
+        p = (math.exp((params.risk_free_rate - params.dividend_yield) * dt) - d) / (u - d)  # Risk-neutral probability
+        return u, d, p, discount
+    
+    def _leisen_reimer_parameters(self, params: OptionParameters, steps: int, strikes=None):
+        """Leisen-Reimer lattice centred on the strike (Peizer-Pratt inversion, method 2)"""
         S = params.spot_price
-        K = params.strike_price
+        K = params.strike_price if strikes is None else strikes
         T = params.time_to_expiry
-        r = params.risk_free_rate
-        q = params.dividend_yield
         sigma = params.volatility
+        carry = params.risk_free_rate - params.dividend_yield
         
-        # Calculate parameters
-        dt = T / steps
-        u = math.exp(sigma * math.sqrt(dt))  # Up factor
-        d = 1 / u  # Down factor
-        p = (math.exp((r - q) * dt) - d) / (u - d)  # Risk-neutral probability
+        sigma_sqrt_T = sigma * math.sqrt(T)
+        d1 = (np.log(S / K) + (carry + 0.5 * sigma ** 2) * T) / sigma_sqrt_T
+        d2 = d1 - sigma_sqrt_T
         
-        # Initialize stock price tree
-        stock_prices = np.zeros((steps + 1, steps + 1))
+        def peizer_pratt(z):
+            a = z / (steps + 1 / 3 + 0.1 / (steps + 1))
+            return 0.5 + np.sign(z) * 0.5 * np.sqrt(1 - np.exp(-a * a * (steps + 1 / 6)))
         
-        # Fill the stock price tree
-        for i in range(steps + 1):
-            for j in range(i + 1):
-                stock_prices[j, i] = S * (u ** (i - j)) * (d ** j)
+        growth = math.exp(carry * T / steps)
+        p = peizer_pratt(d2)
+        p_bar = peizer_pratt(d1)
+        u = growth * p_bar / p
+        d = (growth - p * u) / (1 - p)
+        return u, d, p
+    
+    def _roll_back(self, params: OptionParameters, strikes, spot, u, d, p, discount,
+                   levels: int, stop_level: int, steps: int, tree: str, exercise: str,
+                   record: bool = False, rates=None, vols=None):
+        """Build the terminal level of a lattice and roll it back to `stop_level`
         
-        # Initialize option value tree
-        option_values = np.zeros((steps + 1, steps + 1))
+        The lattice has `levels` steps from a root at `spot`; terminal stock
+        prices are spot * u^(levels - j) * d^j, built with one vectorized power.
+        For "bbs" the last step is replaced by the Black-Scholes price over
+        one step (`rates`/`vols` override the contract's for bumped lattices).
+        Returns the option values at `stop_level` and the early-exercise
+        tracker (None for European exercise).
+        """
+        dt = params.time_to_expiry / steps
+        top_level = levels - 1 if tree == "bbs" else levels
+        stock_prices = self._level_stock_prices(spot, u, d, top_level)
         
-        # Fill terminal option values
-        for j in range(steps + 1):
-            if params.option_type.lower() == "call":
-                option_values[j, steps] = max(0, stock_prices[j, steps] - K)
-            else:
-                option_values[j, steps] = max(0, K - stock_prices[j, steps])
-        
-        # Backward induction
-        discount = math.exp(-r * dt)
-        for i in range(steps - 1, -1, -1):
-            for j in range(i + 1):
-                option_values[j, i] = discount * (
-                    p * option_values[j, i + 1] + (1 - p) * option_values[j + 1, i + 1]
-                )
+        if tree == "bbs":
+            option_values = self._black_scholes.price_batch(
+                stock_prices,
+                params.strike_price if strikes is None else strikes,
+                dt,
+                params.risk_free_rate if rates is None else rates,
+                params.dividend_yield,
+                params.volatility if vols is None else vols,
+                params.option_type.lower() == "call",
+                greeks=()
+            )["price"]
+        else:
+            option_values = self._payoff(params, stock_prices, strikes)
+        
+        early_exercise = self._early_exercise(params, exercise, stock_prices, u, strikes, record)
+        if early_exercise is not None and tree == "bbs":
+            option_values = early_exercise.exercise(option_values)
+        
+        option_values = self._backward_induction(option_values, top_level - stop_level, p, discount, early_exercise)
+        return option_values, early_exercise
+    
+    def _level_stock_prices(self, spot, u, d, level: int) -> np.ndarray:
+        """Stock prices spot * u^(level - j) * d^j for j = 0..level
         
-        return option_values[0, 0]
+        `u`/`d` may be column arrays to build several lattices at once, one
+        per row.
+        """
+        return spot * np.power(u, level) * np.power(d / u, np.arange(level + 1))
+    
+    def _payoff(self, params: OptionParameters, stock_prices: np.ndarray, strikes=None) -> np.ndarray:
+        """Intrinsic value at the given stock prices (`strikes` defaults to the contract strike)"""
+        strike = params.strike_price if strikes is None else strikes
+        if params.option_type.lower() == "call":
+            return np.maximum(stock_prices - strike, 0.0)
+        return np.maximum(strike - stock_prices, 0.0)
+    
+    def _early_exercise(self, params: OptionParameters, exercise: str, stock_prices: np.ndarray,
+                        u, strikes=None, record: bool = False) -> Optional[_EarlyExercise]:
+        if exercise != "american":
+            return None
+        phi = 1.0 if params.option_type.lower() == "call" else -1.0
+        strike = params.strike_price if strikes is None else strikes
+        return _EarlyExercise(stock_prices, u, strike, phi, record)
+    
+    def _format_boundary(self, params: OptionParameters, steps: int, boundary: np.ndarray, strike: float) -> Dict[str, List]:
+        """Early-exercise boundary ordered by time, ending with the strike at expiry
+        
+        `boundary` holds one critical price per rolled-back level, starting at
+        the level just before expiry. Levels where no node is exercised
+        become None.
+        """
+        dt = params.time_to_expiry / steps
+        critical_prices = [None if np.isnan(c) else float(c) for c in boundary[:steps][::-1]] + [strike]
+        return {
+            "times": [i * dt for i in range(steps + 1)],
+            "critical_prices": critical_prices
+        }
+    
+    def _backward_induction(self, option_values: np.ndarray, steps: int, p, discount,
+                            early_exercise: Optional[_EarlyExercise] = None) -> np.ndarray:
+        """Roll option values back `steps` time steps along the last axis"""
+        p_up = discount * p
+        p_down = discount * (1 - p)
+        for _ in range(steps):
+            option_values = p_up * option_values[..., :-1] + p_down * option_values[..., 1:]
+            if early_exercise is not None:
+                option_values = early_exercise.apply(option_values)
+        return option_values
     
-    def _calculate_greeks_finite_diff(self, params: OptionParameters, steps: int) -> Dict[str, float]:
+    def _calculate_greeks_finite_diff(self, params: OptionParameters, steps: int,
+                                      exercise: str = "european", tree: str = "crr",
+                                      richardson: bool = False) -> Dict[str, float]:
         """Calculate Greeks using finite differences"""
         # Base price
-        price_base = self._calculate_price(params, steps)
+        price_base = self._calculate_price(params, steps, exercise, tree, richardson)
         
         # Delta: finite difference with 1% spot price change
         dS = params.spot_price * 0.01
@@ -81,8 +543,8 @@ class BinomialTreeModel(BasePricingModel):
         params_up.spot_price += dS
         params_down.spot_price -= dS
         
-        price_up = self._calculate_price(params_up, steps)
-        price_down = self._calculate_price(params_down, steps)
+        price_up = self._calculate_price(params_up, steps, exercise, tree, richardson)
+        price_down = self._calculate_price(params_down, steps, exercise, tree, richardson)
         delta = (price_up - price_down) / (2 * dS)
         
         # Gamma: second derivative
@@ -92,22 +554,22 @@ class BinomialTreeModel(BasePricingModel):
         dt = 1/365
         params_theta = OptionParameters(**params.__dict__)
         params_theta.time_to_expiry = max(params.time_to_expiry - dt, dt)
-        price_theta = self._calculate_price(params_theta, steps)
+        price_theta = self._calculate_price(params_theta, steps, exercise, tree, richardson)
         theta = (price_theta - price_base)  # Per day change
         
         # Vega: finite difference with volatility (1% change)
         dv = 0.01
         params_vega = OptionParameters(**params.__dict__)
         params_vega.volatility += dv
-        price_vega = self._calculate_price(params_vega, steps)
-        vega = (price_vega - price_base) / 100  # Convert to 1% change
+        price_vega = self._calculate_price(params_vega, steps, exercise, tree, richardson)
+        vega = price_vega - price_base  # Already per 1% change
         
         # Rho: finite difference with interest rate (1% change)
         dr = 0.01
         params_rho = OptionParameters(**params.__dict__)
         params_rho.risk_free_rate += dr
-        price_rho = self._calculate_price(params_rho, steps)
-        rho = (price_rho - price_base) / 100  # Convert to 1% change
+        price_rho = self._calculate_price(params_rho, steps, exercise, tree, richardson)
+        rho = price_rho - price_base  # Already per 1% change
         
         return {
             "delta": delta,
@@ -1,89 +1,148 @@
-import math
-from scipy.stats import norm
-from typing import Dict
+import numpy as np
+from typing import Dict, Iterable, Optional, Tuple
 from .base_model import BasePricingModel, OptionParameters, PricingResult
+from .numerics import SCALAR_OPS, ARRAY_OPS
+
+FIRST_ORDER_GREEKS = ("delta", "gamma", "theta", "vega", "rho")
+HIGHER_ORDER_GREEKS = ("vanna", "volga", "charm", "speed", "zomma", "color")
+ALL_GREEKS = FIRST_ORDER_GREEKS + HIGHER_ORDER_GREEKS
 
 class BlackScholesModel(BasePricingModel):
     
-    def calculate(self, params: OptionParameters, **kwargs) -> PricingResult:
+    def calculate(self, params: OptionParameters, greeks: Optional[Iterable[str]] = None, **kwargs) -> PricingResult:
         """Calculate Black-Scholes option price and Greeks"""
-        price, greeks, computation_time = self._time_calculation(
-            self._calculate_price_and_greeks, params
+        (price, greek_values), computation_time = self._time_calculation(
+            self._calculate_price_and_greeks, params, greeks
         )
         
         return PricingResult(
             price=price,
             computation_time=computation_time,
             model_name="Black-Scholes",
-            greeks=greeks
+            greeks=greek_values
         )
     
-    def calculate_greeks(self, params: OptionParameters, **kwargs) -> Dict[str, float]:
+    def calculate_greeks(self, params: OptionParameters, greeks: Optional[Iterable[str]] = None, **kwargs) -> Dict[str, float]:
         """Calculate only the Greeks (faster when price not needed)"""
-        _, greeks, _ = self._calculate_price_and_greeks(params)
-        return greeks
+        _, greek_values = self._calculate_price_and_greeks(params, greeks)
+        return greek_values
     
-    def _calculate_price_and_greeks(self, params: OptionParameters):
-        """Internal method that calculates both price and Greeks"""
-        S = params.spot_price
-        K = params.strike_price
-        T = params.time_to_expiry
-        r = params.risk_free_rate
-        q = params.dividend_yield
-        sigma = params.volatility
+    def price_batch(self, S, K, T, r, q, sigma, is_call,
+                    greeks: Optional[Iterable[str]] = None) -> Dict[str, np.ndarray]:
+        """Price a batch of contracts and their Greeks in one vectorized pass
         
-        # Calculate d1 and d2
-        d1 = (math.log(S / K) + (r - q + 0.5 * sigma**2) * T) / (sigma * math.sqrt(T))
-        d2 = d1 - sigma * math.sqrt(T)
+        All inputs broadcast against each other, so a chain can be priced by
+        passing an array of strikes with scalar spot/rate/volatility. `is_call`
+        is a boolean mask (True for calls, False for puts), which allows calls
+        and puts to be mixed in the same batch. `greeks` selects which Greeks
+        to return (see `_evaluate`); units match the scalar path.
+        """
+        S, K, T, r, q, sigma, is_call = np.broadcast_arrays(
+            np.asarray(S, dtype=np.float64),
+            np.asarray(K, dtype=np.float64),
+            np.asarray(T, dtype=np.float64),
+            np.asarray(r, dtype=np.float64),
+            np.asarray(q, dtype=np.float64),
+            np.asarray(sigma, dtype=np.float64),
+            np.asarray(is_call, dtype=bool)
+        )
         
-        # Calculate option price
-        if params.option_type.lower() == "call":
-            price = (S * math.exp(-q * T) * norm.cdf(d1) - 
-                    K * math.exp(-r * T) * norm.cdf(d2))
-        else:  # put
-            price = (K * math.exp(-r * T) * norm.cdf(-d2) - 
-                    S * math.exp(-q * T) * norm.cdf(-d1))
+        # +1 for calls, -1 for puts lets one formula cover both payoffs
+        phi = np.where(is_call, 1.0, -1.0)
+        price, greek_values = self._evaluate(
+            S, K, T, r, q, sigma, phi, self._resolve_greeks(greeks), ARRAY_OPS
+        )
+        
+        return {"price": price, **greek_values}
+    
+    def _calculate_price_and_greeks(self, params: OptionParameters, greeks: Optional[Iterable[str]] = None):
+        """Internal method that calculates both price and Greeks"""
+        phi = 1.0 if params.option_type.lower() == "call" else -1.0
         
-        # Calculate Greeks
-        greeks = self._calculate_greeks_analytical(params, d1, d2)
+        return self._evaluate(
+            params.spot_price,
+            params.strike_price,
+            params.time_to_expiry,
+            params.risk_free_rate,
+            params.dividend_yield,
+            params.volatility,
+            phi,
+            self._resolve_greeks(greeks),
+            SCALAR_OPS
+        )
+    
+    def _resolve_greeks(self, greeks: Optional[Iterable[str]]) -> Tuple[str, ...]:
+        """Validate a Greek mask; None selects the five first-order Greeks"""
+        if greeks is None:
+            return FIRST_ORDER_GREEKS
         
-        return price, greeks
+        requested = tuple(g.lower() for g in greeks)
+        unknown = [g for g in requested if g not in ALL_GREEKS]
+        if unknown:
+            raise ValueError(f"Unknown Greeks: {unknown}. Available: {list(ALL_GREEKS)}")
+        return requested
     
-    def _calculate_greeks_analytical(self, params: OptionParameters, d1: float, d2: float) -> Dict[str, float]:
-        """Calculate Greeks using analytical formulas"""
-        S = params.spot_price
-        K = params.strike_price
-        T = params.time_to_expiry
-        r = params.risk_free_rate
-        q = params.dividend_yield
-        sigma = params.volatility
+    def _evaluate(self, S, K, T, r, q, sigma, phi, greeks: Tuple[str, ...], ops):
+        """Price and requested Greeks from one set of shared intermediates
+        
+        `ops` supplies exp/sqrt/log/cdf/pdf, so the same formulas serve the
+        scalar path (math module) and the batch path (NumPy ufuncs). `phi` is
+        +1 for calls and -1 for puts.
+        
+        Units follow the dashboard conventions: theta, charm and color are per
+        day; vega, rho, vanna and zomma are per 1% (one vol or rate point);
+        volga is the change in (per 1%) vega per vol point.
+        """
+        sqrt_T = ops.sqrt(T)
+        sigma_sqrt_T = sigma * sqrt_T
+        div_discount = ops.exp(-q * T)
+        discount = ops.exp(-r * T)
+        
+        # Calculate d1 and d2
+        d1 = (ops.log(S / K) + (r - q + 0.5 * sigma * sigma) * T) / sigma_sqrt_T
+        d2 = d1 - sigma_sqrt_T
+        
+        nd1 = ops.cdf(phi * d1)
+        nd2 = ops.cdf(phi * d2)
+        
+        price = phi * (S * div_discount * nd1 - K * discount * nd2)
         
-        # Common calculations
-        nd1 = norm.cdf(d1)
-        nd2 = norm.cdf(d2)
-        pdf_d1 = norm.pdf(d1)
+        greek_values = {}
+        if not greeks:
+            return price, greek_values
         
-        if params.option_type.lower() == "call":
-            delta = math.exp(-q * T) * nd1
-            theta = ((-S * pdf_d1 * sigma * math.exp(-q * T)) / (2 * math.sqrt(T)) -
-                    r * K * math.exp(-r * T) * nd2 +
-                    q * S * math.exp(-q * T) * nd1)
-            rho = K * T * math.exp(-r * T) * nd2 / 100
-        else:  # put
-            delta = -math.exp(-q * T) * norm.cdf(-d1)
-            theta = ((-S * pdf_d1 * sigma * math.exp(-q * T)) / (2 * math.sqrt(T)) +
-                    r * K * math.exp(-r * T) * norm.cdf(-d2) -
-                    q * S * math.exp(-q * T) * norm.cdf(-d1))
-            rho = -K * T * math.exp(-r * T) * norm.cdf(-d2) / 100
+        # Intermediates shared by the Greeks
+        pdf_d1 = ops.pdf(d1)
+        dq_pdf = div_discount * pdf_d1
+        gamma = dq_pdf / (S * sigma_sqrt_T)
+        vega = S * dq_pdf * sqrt_T
+        drift_term = (2 * (r - q) * T - d2 * sigma_sqrt_T) / (2 * T * sigma_sqrt_T)
         
-        # Gamma and Vega are the same for calls and puts
-        gamma = (pdf_d1 * math.exp(-q * T)) / (S * sigma * math.sqrt(T))
-        vega = S * math.exp(-q * T) * pdf_d1 * math.sqrt(T) / 100
+        for greek in greeks:
+            if greek == "delta":
+                value = phi * div_discount * nd1
+            elif greek == "gamma":
+                value = gamma
+            elif greek == "theta":
+                value = (-S * dq_pdf * sigma / (2 * sqrt_T) -
+                         phi * r * K * discount * nd2 +
+                         phi * q * S * div_discount * nd1) / 365
+            elif greek == "vega":
+                value = vega / 100
+            elif greek == "rho":
+                value = phi * K * T * discount * nd2 / 100
+            elif greek == "vanna":
+                value = -dq_pdf * d2 / sigma / 100
+            elif greek == "volga":
+                value = vega * d1 * d2 / sigma / 10000
+            elif greek == "charm":
+                value = (phi * q * div_discount * nd1 - dq_pdf * drift_term) / 365
+            elif greek == "speed":
+                value = -gamma / S * (d1 / sigma_sqrt_T + 1)
+            elif greek == "zomma":
+                value = gamma * (d1 * d2 - 1) / sigma / 100
+            else:  # color
+                value = gamma / (2 * T) * (2 * q * T + 1 + d1 * (2 * (r - q) * T - d2 * sigma_sqrt_T) / sigma_sqrt_T) / 365
+            greek_values[greek] = value
         
-        return {
-            "delta": delta,
-            "gamma": gamma,
-            "theta": theta / 365,  # Convert to per-day
-            "vega": vega,
-            "rho": rho
-        }
\ No newline at end of file
+        return price, greek_values
\ No newline at end of file
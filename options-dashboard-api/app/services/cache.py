@@ -0,0 +1,484 @@
+import dataclasses
+import hashlib
+import json
+import logging
+import math
+import struct
+import sys
+import threading
+import time
+import numpy as np
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Iterable, Optional
+from .base_model import ModelFailure, OptionParameters, PricingResult
+
+logger = logging.getLogger(__name__)
+
+# Market inputs rounded by quantization; model settings (steps, seeds, ...) never are
+QUANTIZED_FIELDS = ("spot_price", "strike_price", "time_to_expiry", "risk_free_rate",
+                    "volatility", "dividend_yield")
+
+
+def _canonical(value: Any) -> Any:
+    """JSON-ready form of a key component; equal inputs always give equal output"""
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {"__type__": type(value).__name__, **_canonical(dataclasses.asdict(value))}
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in sorted(value.items(), key=lambda item: str(item[0]))}
+    if isinstance(value, np.ndarray):
+        return {"__array__": list(value.shape), "values": _canonical(value.ravel().tolist())}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, np.generic):
+        return _canonical(value.item())
+    if isinstance(value, float):
+        # repr round-trips exactly; normalize -0.0 so it keys like 0.0
+        return repr(value + 0.0)
+    if value is None or isinstance(value, (bool, int, str)):
+        return value
+    if hasattr(value, "__dict__"):
+        # Plain objects (e.g. payoff plugins) key on their state, never their id
+        return {"__type__": type(value).__name__, **_canonical(vars(value))}
+    return repr(value)
+
+
+def canonical_key(namespace: str, inputs: Dict[str, Any]) -> str:
+    """Stable hash of a namespace (model or engine method) and its inputs"""
+    payload = json.dumps([namespace, _canonical(inputs)], separators=(",", ":"))
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+def quantize(value, digits: int):
+    """Round to `digits` significant digits (scalars or arrays)"""
+    if np.ndim(value):
+        values = np.asarray(value, dtype=np.float64)
+        with np.errstate(divide="ignore"):
+            magnitude = np.floor(np.log10(np.abs(values)))
+        scale = 10.0 ** (digits - 1 - np.where(np.isfinite(magnitude), magnitude, 0))
+        return np.round(values * scale) / scale
+    if value == 0 or not math.isfinite(value):
+        return value
+    return float(f"{value:.{digits}g}")
+
+
+def quantize_params(params: OptionParameters, digits: Optional[int]) -> OptionParameters:
+    """Copy of `params` with the market inputs quantized (unchanged when digits is None)"""
+    if digits is None:
+        return params
+    return dataclasses.replace(params, **{
+        field: quantize(getattr(params, field), digits) for field in QUANTIZED_FIELDS
+    })
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate memory held by a cached value, in bytes"""
+    if isinstance(value, np.ndarray):
+        return value.nbytes + 112
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return sys.getsizeof(value) + estimate_size(vars(value))
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value)
+    return sys.getsizeof(value)
+
+
+# Binary cache format: magic, little-endian header length, JSON header, then the
+# raw buffers of every array the header refers to, in order
+CODEC_MAGIC = b"OPC1"
+CODEC_DATACLASSES = {cls.__name__: cls for cls in (PricingResult, OptionParameters, ModelFailure)}
+
+
+def encode_value(value: Any) -> bytes:
+    """Compact binary form of a pricing result (PricingResult, dicts of arrays, ...)
+    
+    Arrays are stored as raw buffers rather than text, so a heatmap costs
+    its nbytes plus a small header. Raises ValueError for anything the
+    format cannot represent.
+    """
+    buffers = []
+    
+    def pack(v):
+        if isinstance(v, np.ndarray):
+            if v.dtype.hasobject:
+                raise ValueError("Object arrays cannot be encoded")
+            buffers.append(np.ascontiguousarray(v).tobytes())
+            return {"__ndarray__": [v.dtype.str, list(v.shape)]}
+        if dataclasses.is_dataclass(v) and not isinstance(v, type):
+            if type(v).__name__ not in CODEC_DATACLASSES:
+                raise ValueError(f"Cannot encode {type(v).__name__}")
+            return {"__dataclass__": [type(v).__name__, pack(vars(v))]}
+        if isinstance(v, dict):
+            if not all(isinstance(k, str) for k in v):
+                raise ValueError("Only string dict keys can be encoded")
+            return {k: pack(item) for k, item in v.items()}
+        if isinstance(v, (list, tuple)):
+            return [pack(item) for item in v]
+        if isinstance(v, np.generic):
+            return v.item()
+        if v is None or isinstance(v, (bool, int, float, str)):
+            return v
+        raise ValueError(f"Cannot encode {type(v).__name__}")
+    
+    header = json.dumps(pack(value), separators=(",", ":")).encode()
+    return b"".join([CODEC_MAGIC, struct.pack("<I", len(header)), header, *buffers])
+
+
+def decode_value(blob: bytes) -> Any:
+    """Inverse of encode_value"""
+    if blob[:len(CODEC_MAGIC)] != CODEC_MAGIC:
+        raise ValueError("Not an encoded pricing result")
+    start = len(CODEC_MAGIC)
+    (length,) = struct.unpack_from("<I", blob, start)
+    offset = start + 4 + length
+    header = json.loads(blob[start + 4:offset])
+    
+    def unpack(v):
+        nonlocal offset
+        if isinstance(v, dict):
+            if "__ndarray__" in v:
+                dtype, shape = v["__ndarray__"]
+                dtype = np.dtype(dtype)
+                count = math.prod(shape)
+                array = np.frombuffer(blob, dtype=dtype, count=count, offset=offset).reshape(shape)
+                offset += count * dtype.itemsize
+                return array.copy()
+            if "__dataclass__" in v:
+                name, fields = v["__dataclass__"]
+                return CODEC_DATACLASSES[name](**unpack(fields))
+            return {k: unpack(item) for k, item in v.items()}
+        if isinstance(v, list):
+            return [unpack(item) for item in v]
+        return v
+    
+    return unpack(header)
+
+
+class PricingCache:
+    """Thread-safe LRU cache with a time-to-live and entry/byte bounds
+    
+    Entries are evicted least recently used first whenever either bound is
+    exceeded; an entry larger than the byte bound on its own is not stored.
+    Entries expire `ttl_seconds` after they are stored; None keeps them
+    until evicted, and a TTL of zero or less is rejected (disable the cache
+    instead).
+    Cached values are shared between callers and must be treated as
+    read-only.
+    """
+    
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 64 * 1024 * 1024,
+                 ttl_seconds: Optional[float] = 300.0, quantize_digits: Optional[int] = None):
+        if max_entries < 1 or max_bytes < 1:
+            raise ValueError("Cache bounds must be positive")
+        if quantize_digits is not None and quantize_digits < 1:
+            raise ValueError("Quantization needs at least 1 significant digit")
+        if ttl_seconds is not None and ttl_seconds <= 0:
+            raise ValueError("Cache TTL must be positive, or None for entries that never expire")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.quantize_digits = quantize_digits
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (value, size, expires_at)
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            value, size, expires_at = entry
+            if expires_at is not None and time.monotonic() >= expires_at:
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def peek(self, key: str, default: Any = None) -> Any:
+        """Like get, but leaves the counters and the LRU order untouched"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or (entry[2] is not None and time.monotonic() >= entry[2]):
+                return default
+            return entry[0]
+    
+    def put(self, key: str, value: Any):
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            return
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds is not None else None
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, size, expires_at)
+            self.bytes += size
+            while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+    
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """The cached values among `keys` (misses are left out)"""
+        missing = object()
+        found = {key: self.get(key, missing) for key in keys}
+        return {key: value for key, value in found.items() if value is not missing}
+    
+    def put_many(self, items: Dict[str, Any]):
+        for key, value in items.items():
+            self.put(key, value)
+    
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        """Cached value for `key`, computing and storing it on a miss"""
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = compute()
+            self.put(key, value)
+        return value
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "quantize_digits": self.quantize_digits,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions,
+                "expirations": self.expirations
+            }
+    
+    def _remove(self, key: str):
+        _, size, _ = self._entries.pop(key)
+        self.bytes -= size
+
+
+class SingleFlight:
+    """Coalesces concurrent calls for the same key into one computation
+    
+    The first caller for a key (the leader) runs the computation; callers
+    arriving while it runs wait on the leader's future and receive the
+    same result or exception instead of computing it again.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[str, Future] = {}
+        self.computations = 0
+        self.coalesced = 0
+    
+    def do(self, key: str, compute: Callable[[], Any]) -> Any:
+        with self._lock:
+            future = self._flights.get(key)
+            leader = future is None
+            if leader:
+                future = self._flights[key] = Future()
+                self.computations += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            return future.result()
+        
+        try:
+            value = compute()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            with self._lock:
+                del self._flights[key]
+    
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "in_flight": len(self._flights),
+                "computations": self.computations,
+                "computations_saved": self.coalesced
+            }
+
+
+class RedisCache:
+    """Shared L2 tier storing encoded results in Redis
+    
+    `client` is any redis-py compatible client (a real Redis, a local
+    redis-server or a fake for tests). Lookups go out as one MGET and
+    writes as one non-transactional pipeline. Any Redis error switches
+    the tier off for `retry_seconds`, during which lookups miss and
+    writes are dropped, so an outage only ever costs recomputation.
+    """
+    
+    def __init__(self, client, ttl_seconds: Optional[float] = 300.0, prefix: str = "pricing:v1:",
+                 retry_seconds: float = 30.0):
+        if ttl_seconds is not None and ttl_seconds <= 0:
+            raise ValueError("Cache TTL must be positive, or None for entries that never expire")
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+        self.retry_seconds = retry_seconds
+        self._lock = threading.Lock()
+        self._down_until = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.bypassed = 0
+    
+    @property
+    def available(self) -> bool:
+        return time.monotonic() >= self._down_until
+    
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """The cached values among `keys`, fetched in a single MGET"""
+        keys = list(keys)
+        if not keys:
+            return {}
+        if not self.available:
+            self._count(bypassed=1)
+            return {}
+        try:
+            blobs = self.client.mget([self.prefix + key for key in keys])
+        except Exception as e:  # Redis errors vary by client; any of them means bypass
+            self._failed(e)
+            return {}
+        
+        found = {}
+        for key, blob in zip(keys, blobs):
+            if blob is None:
+                continue
+            try:
+                found[key] = decode_value(blob)
+            except (ValueError, KeyError, TypeError):
+                logger.warning("Discarding undecodable cache entry %s", key)
+        self._count(hits=len(found), misses=len(keys) - len(found))
+        return found
+    
+    def put_many(self, items: Dict[str, Any]):
+        """Store several values in one pipeline round trip"""
+        if not items:
+            return
+        if not self.available:
+            self._count(bypassed=1)
+            return
+        try:
+            pipeline = self.client.pipeline(transaction=False)
+            for key, value in items.items():
+                try:
+                    blob = encode_value(value)
+                except ValueError:
+                    continue
+                ttl_ms = int(self.ttl_seconds * 1000) if self.ttl_seconds is not None else None
+                pipeline.set(self.prefix + key, blob, px=ttl_ms)
+            pipeline.execute()
+        except Exception as e:  # See get_many
+            self._failed(e)
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "available": self.available,
+                "hits": self.hits,
+                "misses": self.misses,
+                "errors": self.errors,
+                "bypassed": self.bypassed
+            }
+    
+    def _count(self, hits: int = 0, misses: int = 0, bypassed: int = 0):
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+            self.bypassed += bypassed
+    
+    def _failed(self, error: Exception):
+        with self._lock:
+            self.errors += 1
+            self._down_until = time.monotonic() + self.retry_seconds
+        logger.warning("Redis cache unavailable, bypassing for %.3gs: %s", self.retry_seconds, error)
+
+
+class TieredCache:
+    """In-process L1 (PricingCache) in front of a shared Redis L2
+    
+    Reads try L1, then L2 (L2 hits are promoted into L1); writes go to
+    both. Offers the same interface as PricingCache.
+    """
+    
+    def __init__(self, l1: PricingCache, l2: RedisCache):
+        self.l1 = l1
+        self.l2 = l2
+    
+    @property
+    def quantize_digits(self) -> Optional[int]:
+        return self.l1.quantize_digits
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.get_many([key]).get(key, default)
+    
+    def peek(self, key: str, default: Any = None) -> Any:
+        """L1 only, without counting: never costs a Redis round trip"""
+        return self.l1.peek(key, default)
+    
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        keys = list(keys)
+        found = self.l1.get_many(keys)
+        remote = self.l2.get_many([key for key in keys if key not in found])
+        for key, value in remote.items():
+            self.l1.put(key, value)
+        found.update(remote)
+        return found
+    
+    def put(self, key: str, value: Any):
+        self.put_many({key: value})
+    
+    def put_many(self, items: Dict[str, Any]):
+        for key, value in items.items():
+            self.l1.put(key, value)
+        self.l2.put_many(items)
+    
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = compute()
+            self.put(key, value)
+        return value
+    
+    def clear(self):
+        """Clear this process's L1; shared L2 entries expire by TTL"""
+        self.l1.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        return {**self.l1.stats(), "l2": self.l2.stats()}
+
+
+def redis_client(url: str, timeout_seconds: float):
+    """redis-py client for `url`, or None when the redis package is missing
+    
+    Connections are made lazily on first use, with short timeouts so an
+    unreachable server degrades to a quick bypass instead of a stall.
+    """
+    try:
+        import redis
+    except ImportError:
+        logger.info("redis package not installed; pricing cache runs without the Redis tier")
+        return None
+    return redis.Redis.from_url(url, socket_timeout=timeout_seconds, socket_connect_timeout=timeout_seconds)
\ No newline at end of file
@@ -0,0 +1,168 @@
+import math
+import numpy as np
+from typing import Dict
+from .black_scholes import BlackScholesModel
+
+# Per-contract status codes returned by the solver
+CONVERGED = 0
+BELOW_INTRINSIC = 1
+ABOVE_MAX_PRICE = 2
+NOT_CONVERGED = 3
+INVALID_INPUT = 4
+OUT_OF_RANGE = 5
+
+STATUS_MESSAGES = {
+    CONVERGED: "converged",
+    BELOW_INTRINSIC: "price below intrinsic value",
+    ABOVE_MAX_PRICE: "price above no-arbitrage upper bound",
+    NOT_CONVERGED: "did not converge",
+    INVALID_INPUT: "invalid input",
+    OUT_OF_RANGE: "implied volatility outside the search interval",
+}
+
+
+class ImpliedVolatilitySolver:
+    """Vectorized Black-Scholes implied volatility inversion
+
+    `price_tolerance` is relative to the market price, so deep out-of-the-
+    money quotes worth fractions of a cent are matched as tightly as
+    at-the-money ones.
+    """
+
+    def __init__(self,
+                 model: BlackScholesModel = None,
+                 min_vol: float = 1e-4,
+                 max_vol: float = 5.0,
+                 price_tolerance: float = 1e-10,
+                 vol_tolerance: float = 1e-10,
+                 max_iterations: int = 100):
+        self.model = model or BlackScholesModel()
+        self.min_vol = min_vol
+        self.max_vol = max_vol
+        self.price_tolerance = price_tolerance
+        self.vol_tolerance = vol_tolerance
+        self.max_iterations = max_iterations
+
+    def solve(self, market_price, S, K, T, r, q, is_call) -> Dict[str, np.ndarray]:
+        """Invert a whole chain of market prices to implied volatilities
+
+        Uses a safeguarded Newton iteration: every contract keeps a bracket
+        [lo, hi] around the root, and a Newton step that leaves the bracket
+        (or has a vanishing vega) falls back to bisection. Only contracts that
+        are still active are repriced on each iteration.
+
+        A contract converges when its model price matches the market price
+        within the relative tolerance, or when the Newton/bisection step
+        falls below `vol_tolerance` while the bracket lies strictly inside
+        (min_vol, max_vol). A bracket that closes onto min_vol or max_vol
+        without matching the price means the implied volatility lies
+        outside the search interval (OUT_OF_RANGE).
+
+        Returns implied volatilities (NaN where the solve failed), per-contract
+        status codes and iteration counts.
+        """
+        price, S, K, T, r, q, is_call = np.broadcast_arrays(
+            np.asarray(market_price, dtype=np.float64),
+            np.asarray(S, dtype=np.float64),
+            np.asarray(K, dtype=np.float64),
+            np.asarray(T, dtype=np.float64),
+            np.asarray(r, dtype=np.float64),
+            np.asarray(q, dtype=np.float64),
+            np.asarray(is_call, dtype=bool)
+        )
+        shape = price.shape
+        price, S, K, T, r, q, is_call = (
+            a.ravel() for a in (price, S, K, T, r, q, is_call)
+        )
+
+        status = np.full(price.shape, NOT_CONVERGED, dtype=np.int8)
+        iterations = np.zeros(price.shape, dtype=np.int32)
+        vol = np.full(price.shape, np.nan)
+
+        # Reject inputs the model cannot price
+        with np.errstate(invalid="ignore"):
+            invalid = ~((S > 0) & (K > 0) & (T > 0) & np.isfinite(price) &
+                        np.isfinite(r) & np.isfinite(q))
+        status[invalid] = INVALID_INPUT
+
+        # No-arbitrage bounds
+        forward_spot = S * np.exp(-q * T)
+        discounted_strike = K * np.exp(-r * T)
+        lower_bound = np.where(is_call,
+                               np.maximum(forward_spot - discounted_strike, 0.0),
+                               np.maximum(discounted_strike - forward_spot, 0.0))
+        upper_bound = np.where(is_call, forward_spot, discounted_strike)
+
+        below = ~invalid & (price <= lower_bound)
+        above = ~invalid & (price >= upper_bound)
+        status[below] = BELOW_INTRINSIC
+        status[above] = ABOVE_MAX_PRICE
+
+        active = np.flatnonzero(~(invalid | below | above))
+        lo = np.full(price.shape, self.min_vol)
+        hi = np.full(price.shape, self.max_vol)
+        vol[active] = self._initial_guess(
+            price[active], forward_spot[active], discounted_strike[active],
+            T[active], is_call[active]
+        )
+
+        for iteration in range(1, self.max_iterations + 1):
+            if active.size == 0:
+                break
+
+            sigma = vol[active]
+            batch = self.model.price_batch(
+                S[active], K[active], T[active], r[active], q[active], sigma, is_call[active],
+                greeks=("vega",)
+            )
+            diff = batch["price"] - price[active]
+            vega = batch["vega"] * 100  # Back to per unit of volatility
+            iterations[active] = iteration
+
+            # Tighten the bracket: price is increasing in volatility
+            too_high = diff > 0
+            hi[active] = np.where(too_high, sigma, hi[active])
+            lo[active] = np.where(too_high, lo[active], sigma)
+
+            done = np.abs(diff) <= self.price_tolerance * price[active]
+
+            # Newton step, replaced by bisection when it leaves the bracket
+            with np.errstate(divide="ignore", invalid="ignore"):
+                newton = sigma - diff / vega
+            bisect = 0.5 * (lo[active] + hi[active])
+            use_newton = np.isfinite(newton) & (newton > lo[active]) & (newton < hi[active])
+            next_sigma = np.where(use_newton, newton, bisect)
+
+            # A vanishing step only counts while the root is bracketed away from the bounds
+            interior = (lo[active] > self.min_vol) & (hi[active] < self.max_vol)
+            done |= interior & (np.abs(next_sigma - sigma) <= self.vol_tolerance)
+            collapsed = ~done & ~interior & (hi[active] - lo[active] <= self.vol_tolerance)
+
+            vol[active] = np.where(done, sigma, next_sigma)
+            status[active[done]] = CONVERGED
+            status[active[collapsed]] = OUT_OF_RANGE
+            active = active[~(done | collapsed)]
+
+        vol[status != CONVERGED] = np.nan
+
+        return {
+            "implied_volatility": vol.reshape(shape),
+            "status": status.reshape(shape),
+            "iterations": iterations.reshape(shape)
+        }
+
+    def _initial_guess(self, price, forward_spot, discounted_strike, T, is_call):
+        """Corrado-Miller approximation, clipped into the search interval"""
+        # Work with the call price (put-call parity) so one formula covers both
+        call_price = np.where(is_call, price, price + forward_spot - discounted_strike)
+
+        half_moneyness = 0.5 * (forward_spot - discounted_strike)
+        centre = call_price - half_moneyness
+        radicand = centre**2 - (forward_spot - discounted_strike)**2 / math.pi
+
+        with np.errstate(invalid="ignore"):
+            guess = (math.sqrt(2 * math.pi) / (forward_spot + discounted_strike) *
+                     (centre + np.sqrt(np.maximum(radicand, 0.0))) / np.sqrt(T))
+
+        guess = np.where(np.isfinite(guess) & (guess > 0), guess, 0.2)
+        return np.clip(guess, self.min_vol * 10, self.max_vol / 2)
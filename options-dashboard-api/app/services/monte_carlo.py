@@ -1,48 +1,1071 @@
+import time
+import threading
 import numpy as np
 import math
-from typing import Dict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from numpy.polynomial import hermite_e, laguerre, polynomial
+from typing import Callable, Dict, List, Optional, Tuple, Any
+from ..config import settings
 from .base_model import BasePricingModel, OptionParameters, PricingResult
+from .black_scholes import BlackScholesModel
+from .path_payoffs import PathPayoff, PathStatistics, build_payoff
+from .random_streams import (
+    SAMPLERS, SobolNormals, block_generator, brownian_bridge, child_sequence, seed_sequence
+)
+
+GREEKS_METHODS = ("finite_difference", "pathwise")
+CONTROL_VARIATES = ("black_scholes", "terminal_spot")
+EXECUTORS = ("thread", "process")
+EXERCISE_STYLES = ("european", "american", "bermudan")
+
+# Longstaff-Schwartz regression bases (Vandermonde builders), applied to moneyness S/K
+LSM_BASES = {
+    "monomial": polynomial.polyvander,
+    "laguerre": laguerre.lagvander,
+    "hermite": hermite_e.hermevander,
+}
+MAX_LSM_DEGREE = 8
+PATH_DTYPES = ("float64", "float32")
+
+# Longstaff-Schwartz keeps its training paths (dates x paths) in memory
+MAX_LSM_TRAINING_BYTES = 256 * 1024 * 1024
+
+# Order of the per-path sample rows produced by the Greeks estimators
+SAMPLE_ROWS = ("price", "delta", "gamma", "theta", "vega", "rho")
+
+# Paths per block. Every block draws from its own stream derived from the seed
+# and the block index, and is reduced on its own, so results depend only on
+# the seed and the path count, never on how blocks are grouped into chunks
+BLOCK_SIZE = 8192
+
+# Default paths simulated per vectorized chunk (a whole number of blocks);
+# memory is bounded by a few arrays of this length
+CHUNK_SIZE = 65536
+
+# Path cap for adaptive runs that reach neither their error target nor time budget
+MAX_ADAPTIVE_SIMULATIONS = 10_000_000
+
+# Monitoring dates of the time-stepped engine (also the Sobol dimension)
+MAX_TIME_STEPS = 5000
+
+# A time budget is checked between blocks, so time-stepped runs with one get
+# blocks of at most this many path steps (never fewer than MIN_TIMED_BLOCK
+# paths). Such runs are not reproducible anyway, so nothing else changes.
+TIMED_BLOCK_PATH_STEPS = 262_144
+MIN_TIMED_BLOCK = 64
+
+# Chain contracts whose per-path samples are evaluated in one broadcast pass
+CHAIN_BATCH = 32
+
+
+class _RunningMoments:
+    """Streaming means and co-moments of k variables
+    
+    Each block is summarized on its own with centred (Welford) sums and
+    folded in with Chan et al.'s pairwise update, which stays accurate when
+    the mean dwarfs the spread. Merging the same blocks in the same order
+    always gives the same bits. `diagonal` keeps only the variances, for
+    chains with too many rows for a full co-moment matrix.
+    """
+    
+    def __init__(self, k: int, diagonal: bool = False):
+        self.diagonal = diagonal
+        self.count = 0
+        self.mean = np.zeros(k)
+        self.comoment = np.zeros(k) if diagonal else np.zeros((k, k))
+    
+    @staticmethod
+    def summarize(observations: np.ndarray, diagonal: bool = False) -> Tuple[int, np.ndarray, np.ndarray]:
+        """Count, mean and co-moment matrix (or vector of squared deviations) of a (k, n) block"""
+        n = observations.shape[-1]
+        mean = np.mean(observations, axis=-1)
+        centered = observations - mean[:, np.newaxis]
+        if diagonal:
+            return n, mean, np.einsum("ij,ij->i", centered, centered)
+        return n, mean, centered @ centered.T
+    
+    def merge(self, n: int, mean: np.ndarray, comoment: np.ndarray):
+        """Fold in the count, mean and co-moment matrix of another sample"""
+        if n == 0:
+            return
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean = self.mean + delta * (n / total)
+        spread = delta * delta if self.diagonal else np.outer(delta, delta)
+        self.comoment = self.comoment + comoment + spread * (self.count * n / total)
+        self.count = total
+    
+    def covariance(self) -> np.ndarray:
+        return self.comoment / (self.count - 1)
+    
+    def moments(self) -> Tuple[np.ndarray, np.ndarray, int]:
+        """Mean, covariance and number of observations"""
+        return self.mean, self.covariance(), self.count
+
+
+class _ReplicateMoments:
+    """Running per-replicate means for randomized QMC
+    
+    Blocks arrive laid out replicate by replicate; only the replicate means
+    are independent, so they are the observations the moments describe.
+    """
+    
+    def __init__(self, k: int, replicates: int, diagonal: bool = False):
+        self.diagonal = diagonal
+        self.replicates = replicates
+        self.count = 0
+        self.replicate_means = np.zeros((k, replicates))
+    
+    @staticmethod
+    def summarize(observations: np.ndarray, replicates: int) -> Tuple[int, np.ndarray]:
+        """Points per replicate and per-replicate means of a (k, replicates * n) block"""
+        blocks = observations.reshape(observations.shape[0], replicates, -1)
+        return blocks.shape[-1], np.mean(blocks, axis=-1)
+    
+    def merge(self, n: int, replicate_means: np.ndarray):
+        """Fold in the per-replicate means of n further points"""
+        self.count += n
+        self.replicate_means += (replicate_means - self.replicate_means) * (n / self.count)
+    
+    def moments(self) -> Tuple[np.ndarray, np.ndarray, int]:
+        """Mean and covariance (or variances) of the replicate means, and the replicate count"""
+        if self.diagonal:
+            spread = np.var(self.replicate_means, axis=-1, ddof=1)
+        else:
+            # np.cov of a single row is a 0-d scalar; keep it a 1x1 matrix
+            spread = np.atleast_2d(np.cov(self.replicate_means))
+        return np.mean(self.replicate_means, axis=-1), spread, self.replicates
+
+
+@dataclass
+class _SimulationPlan:
+    """Everything a worker needs to simulate any range of blocks"""
+    params: OptionParameters
+    root: np.random.SeedSequence
+    bit_generator: str
+    greeks_method: str
+    control_variate: Optional[str]
+    antithetic: bool
+    replicates: Optional[int]  # None for pseudo-random sampling
+    limit: int
+    block_paths: int
+    block_points: int
+    blocks_per_chunk: int
+    payoffs: Tuple[PathPayoff, ...] = ()  # Path-dependent payoffs of the time-stepped engine
+    time_steps: int = 0  # 0 simulates the terminal price only
+    expiries: Tuple[float, ...] = ()  # Chain mode: ascending expiries simulated on shared paths
+    strikes: Tuple[np.ndarray, ...] = ()  # Chain mode: strikes at each expiry
+    
+    @property
+    def dimensions(self) -> int:
+        """Normals per path: one per expiry in chain mode, one per step when time-stepped"""
+        return len(self.expiries) or self.time_steps or 1
+
 
 class MonteCarloModel(BasePricingModel):
+
+    # Worker pools shared by all instances, keyed by (executor, workers)
+    _executors: Dict[Tuple[str, int], Executor] = {}
+    _executors_lock = threading.Lock()
+    
+    def __init__(self, workers: Optional[int] = None, executor: Optional[str] = None):
+        self._black_scholes = BlackScholesModel()
+        self.workers = workers or settings.MONTE_CARLO_WORKERS
+        self.executor = executor or settings.MONTE_CARLO_EXECUTOR
+        if self.executor not in EXECUTORS:
+            raise ValueError(f"Executor must be one of {EXECUTORS}, got '{self.executor}'")
     
-    def calculate(self, params: OptionParameters, simulations: int = 10000, **kwargs) -> PricingResult:
-        """Calculate Monte Carlo option price and Greeks"""
-        price, computation_time = self._time_calculation(
-            self._calculate_price, params, simulations
+    def calculate(self, params: OptionParameters, simulations: int = 10000,
+                  seed: Optional[int] = 42, bit_generator: str = "pcg64",
+                  greeks_method: str = "finite_difference", antithetic: bool = False,
+                  control_variate: Optional[str] = None, sampler: str = "pseudo",
+                  replicates: int = 16, target_stderr: Optional[float] = None,
+                  max_time_ms: Optional[float] = None, chunk_size: int = CHUNK_SIZE,
+                  workers: Optional[int] = None, exercise: str = "european", **kwargs) -> PricingResult:
+        """Calculate Monte Carlo option price and Greeks
+        
+        Random numbers come from a Generator built for this request from
+        `seed` (None for fresh entropy), so results are reproducible and
+        concurrent requests share no RNG state. The price and Greeks come
+        from one set of draws; every Greek is reported with its standard error.
+        
+        `antithetic` pairs every draw z with -z. `control_variate` adjusts the
+        price with a control of known mean: "terminal_spot" (the discounted
+        terminal price, worth S * exp(-qT)). The "black_scholes" control is
+        the vanilla payoff itself, so it is only accepted for path-dependent
+        payoffs (calculate_path_dependent). The result reports the price's
+        standard error and the variance reduction achieved against plain
+        sampling with the same number of paths.
+        
+        sampler="sobol" replaces the pseudo-random normals with randomized
+        quasi-Monte Carlo: `replicates` independently scrambled Sobol point
+        sets, each rounded up to a power of two, whose spread gives the error.
+        
+        Passing `target_stderr` and/or `max_time_ms` makes the run adaptive:
+        paths are simulated until the price's standard error reaches the
+        target or the time budget is spent (whichever comes first), and
+        `simulations` is ignored in favour of MAX_ADAPTIVE_SIMULATIONS.
+        
+        Paths are streamed `chunk_size` at a time, so memory stays constant
+        for any path count, and split over `workers` (default from settings).
+        Neither the chunk size nor the worker count changes the result.
+        
+        American or Bermudan `exercise` is priced by Longstaff-Schwartz (see
+        calculate_longstaff_schwartz, which receives the remaining kwargs).
+        """
+        if exercise not in EXERCISE_STYLES:
+            raise ValueError(f"Exercise must be one of {EXERCISE_STYLES}, got '{exercise}'")
+        if exercise != "european":
+            if (control_variate is not None or sampler != "pseudo" or
+                    target_stderr is not None or max_time_ms is not None):
+                raise ValueError("Early exercise is priced with plain pseudo-random paths: "
+                                 "control variates, Sobol sampling and adaptive runs are not supported")
+            return self.calculate_longstaff_schwartz(
+                params, simulations=simulations, exercise=exercise, seed=seed,
+                bit_generator=bit_generator, antithetic=antithetic, **kwargs
+            )
+        
+        if control_variate == "black_scholes":
+            raise ValueError("The 'black_scholes' control is the European payoff itself and would "
+                             "return the analytical price with zero error; use 'terminal_spot'")
+        
+        workers = workers or self.workers
+        estimate, computation_time = self._time_calculation(
+            self._calculate_price_and_greeks, params, simulations, seed, bit_generator,
+            greeks_method, antithetic, control_variate, sampler, replicates,
+            target_stderr, max_time_ms, chunk_size, workers
         )
         
-        # Calculate Greeks using finite differences
-        greeks = self.calculate_greeks(params, simulations=simulations)
+        parameters = {
+            "simulations": estimate["paths"],
+            "workers": workers,
+            "seed": seed,
+            "bit_generator": bit_generator,
+            "greeks_method": greeks_method,
+            "antithetic": antithetic,
+            "control_variate": control_variate,
+            "sampler": sampler
+        }
+        if sampler == "sobol":
+            parameters["replicates"] = replicates
+        if target_stderr is not None or max_time_ms is not None:
+            parameters["target_stderr"] = target_stderr
+            parameters["max_time_ms"] = max_time_ms
+            parameters["stopped_by"] = estimate["stopped_by"]
         
         return PricingResult(
-            price=price,
+            price=estimate["price"],
             computation_time=computation_time,
             model_name="Monte Carlo",
-            greeks=greeks,
-            parameters={"simulations": simulations}
+            greeks=estimate["greeks"],
+            parameters=parameters,
+            greek_standard_errors=estimate["greek_standard_errors"],
+            standard_error=estimate["standard_error"],
+            variance_reduction_factor=estimate["variance_reduction_factor"]
         )
     
-    def calculate_greeks(self, params: OptionParameters, simulations: int = 10000, **kwargs) -> Dict[str, float]:
-        """Calculate Greeks using finite differences"""
-        return self._calculate_greeks_finite_diff(params, simulations)
+    def calculate_greeks(self, params: OptionParameters, simulations: int = 10000,
+                         seed: Optional[int] = 42, bit_generator: str = "pcg64",
+                         greeks_method: str = "finite_difference", antithetic: bool = False,
+                         sampler: str = "pseudo", replicates: int = 16,
+                         workers: Optional[int] = None, method: Optional[str] = None,
+                         **kwargs) -> Dict[str, float]:
+        """Calculate Greeks by finite differences or pathwise/likelihood-ratio estimators
+        
+        The estimator is selected by `method` ("finite_difference" or
+        "pathwise"), or equivalently by `greeks_method`.
+        """
+        if method is not None:
+            if greeks_method not in (method, "finite_difference"):
+                raise ValueError(f"Conflicting Greeks methods '{method}' and '{greeks_method}'")
+            greeks_method = method
+        return self._calculate_price_and_greeks(
+            params, simulations, seed, bit_generator, greeks_method, antithetic,
+            sampler=sampler, replicates=replicates, workers=workers or self.workers
+        )["greeks"]
     
-    def _calculate_price(self, params: OptionParameters, simulations: int, seed: int = 42) -> float:
-        """Calculate option price using Monte Carlo simulation"""
-        # Set seed for reproducible results during development
-        np.random.seed(seed)
+    def calculate_path_dependent(self, params: OptionParameters, payoffs: List[Any],
+                                 time_steps: int = 252, simulations: int = 10000,
+                                 seed: Optional[int] = 42, bit_generator: str = "pcg64",
+                                 antithetic: bool = False, control_variate: Optional[str] = None,
+                                 sampler: str = "pseudo", replicates: int = 16,
+                                 target_stderr: Optional[float] = None,
+                                 max_time_ms: Optional[float] = None, chunk_size: int = CHUNK_SIZE,
+                                 workers: Optional[int] = None) -> Dict[str, Any]:
+        """Price path-dependent payoffs on time-stepped GBM paths
         
-        S = params.spot_price
+        `payoffs` are PathPayoff plugins or specs for path_payoffs.build_payoff
+        (Asian, barrier, lookback); all of them are evaluated on the same
+        paths in one pass. Paths are monitored at `time_steps` equally spaced
+        dates up to expiry, and the option's strike and type apply to every
+        payoff. Sampling, control variate, adaptive and worker options behave
+        as in `calculate`; an adaptive target applies to the largest payoff
+        standard error.
+        
+        Returns per-payoff price, standard error and variance reduction
+        factor keyed by payoff name, with the run's settings.
+        """
+        payoffs = tuple(p if isinstance(p, PathPayoff) else build_payoff(p) for p in payoffs)
+        if not payoffs:
+            raise ValueError("At least one payoff is required")
+        names = [payoff.name for payoff in payoffs]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Payoff names must be unique, got {names}")
+        if not 1 <= time_steps <= MAX_TIME_STEPS:
+            raise ValueError(f"Time steps must be between 1 and {MAX_TIME_STEPS}")
+        
+        workers = workers or self.workers
+        adaptive = target_stderr is not None or max_time_ms is not None
+        
+        def price_payoffs():
+            plan = self._plan(params, MAX_ADAPTIVE_SIMULATIONS if adaptive else simulations, seed,
+                              bit_generator, antithetic, control_variate, sampler, replicates,
+                              chunk_size, workers, payoffs=payoffs, time_steps=time_steps,
+                              timed=max_time_ms is not None)
+            control_mean = self._control_mean(params, control_variate) if control_variate else None
+            paths, units, stopped_by = self._run(
+                plan, len(payoffs), workers, target_stderr, max_time_ms,
+                lambda paths, units: max(estimate["standard_error"] for estimate in
+                                         self._summarize_payoffs(plan, paths, units, control_mean).values())
+            )
+            return self._summarize_payoffs(plan, paths, units, control_mean), paths.count, stopped_by
+        
+        (estimates, n_paths, stopped_by), computation_time = self._time_calculation(price_payoffs)
+        
+        parameters = {
+            "simulations": n_paths,
+            "time_steps": time_steps,
+            "workers": workers,
+            "seed": seed,
+            "bit_generator": bit_generator,
+            "antithetic": antithetic,
+            "control_variate": control_variate,
+            "sampler": sampler
+        }
+        if sampler == "sobol":
+            parameters["replicates"] = replicates
+        if adaptive:
+            parameters["target_stderr"] = target_stderr
+            parameters["max_time_ms"] = max_time_ms
+            parameters["stopped_by"] = stopped_by
+        
+        return {
+            "payoffs": estimates,
+            "parameters": parameters,
+            "computation_time": computation_time
+        }
+    
+    def calculate_chain(self, params: OptionParameters, strikes, expiries=None,
+                        simulations: int = 10000, seed: Optional[int] = 42,
+                        bit_generator: str = "pcg64", greeks_method: str = "finite_difference",
+                        antithetic: bool = False, sampler: str = "pseudo", replicates: int = 16,
+                        target_stderr: Optional[float] = None, max_time_ms: Optional[float] = None,
+                        chunk_size: int = CHUNK_SIZE, workers: Optional[int] = None,
+                        **kwargs) -> Dict[str, Any]:
+        """Price a chain of strikes and expiries on one shared simulation
+        
+        `params` supplies spot, volatility, rates and option type; its strike
+        and expiry are replaced by `strikes` and `expiries` (scalars or
+        arrays broadcast against each other, default the params' expiry).
+        The underlying is simulated once to every distinct expiry and each
+        contract is priced from those shared samples, so the chain costs
+        roughly one simulation instead of one per contract.
+        
+        Returns arrays aligned with the contracts: price, Greeks, the price
+        standard error and per-Greek standard errors. Sampling, adaptive and
+        worker options behave as in `calculate` (an adaptive target applies
+        to the largest price error); control variates are not supported.
+        """
+        if greeks_method not in GREEKS_METHODS:
+            raise ValueError(f"Unknown Greeks method: {greeks_method}")
+        strikes, expiries = np.broadcast_arrays(
+            np.atleast_1d(np.asarray(strikes, dtype=np.float64)),
+            np.asarray(params.time_to_expiry if expiries is None else expiries, dtype=np.float64)
+        )
+        if strikes.ndim != 1:
+            raise ValueError("Strikes and expiries must be scalars or 1-D arrays")
+        if np.any(strikes <= 0) or np.any(expiries <= 0):
+            raise ValueError("Strikes and expiries must be positive")
+        
+        workers = workers or self.workers
+        adaptive = target_stderr is not None or max_time_ms is not None
+        
+        # Contracts grouped by expiry; `order` maps them back to input order
+        dates, inverse = np.unique(expiries, return_inverse=True)
+        grouping = np.argsort(inverse, kind="stable")
+        order = np.argsort(grouping, kind="stable")
+        strike_groups = tuple(strikes[inverse == i] for i in range(dates.size))
+        
+        def price_chain():
+            plan = self._plan(params, MAX_ADAPTIVE_SIMULATIONS if adaptive else simulations, seed,
+                              bit_generator, antithetic, None, sampler, replicates, chunk_size, workers,
+                              greeks_method=greeks_method, expiries=tuple(dates.tolist()),
+                              strikes=strike_groups, timed=max_time_ms is not None)
+            paths, units, stopped_by = self._run(
+                plan, len(SAMPLE_ROWS) * strikes.size, workers, target_stderr, max_time_ms,
+                lambda paths, units: float(np.max(self._summarize_chain(paths, units)["standard_error"]))
+            )
+            return self._summarize_chain(paths, units), stopped_by
+        
+        (estimate, stopped_by), computation_time = self._time_calculation(price_chain)
+        
+        parameters = {
+            "simulations": estimate.pop("paths"),
+            "workers": workers,
+            "seed": seed,
+            "bit_generator": bit_generator,
+            "greeks_method": greeks_method,
+            "antithetic": antithetic,
+            "sampler": sampler
+        }
+        if sampler == "sobol":
+            parameters["replicates"] = replicates
+        if adaptive:
+            parameters["target_stderr"] = target_stderr
+            parameters["max_time_ms"] = max_time_ms
+            parameters["stopped_by"] = stopped_by
+        
+        chain = {key: value[order] for key, value in estimate.items() if key != "greek_standard_errors"}
+        chain["greek_standard_errors"] = {
+            greek: errors[order] for greek, errors in estimate["greek_standard_errors"].items()
+        }
+        chain["expiries"] = expiries
+        chain["parameters"] = parameters
+        chain["computation_time"] = computation_time
+        return chain
+    
+    def calculate_longstaff_schwartz(self, params: OptionParameters, simulations: int = 10000,
+                                     training_simulations: Optional[int] = None,
+                                     exercise: str = "american", exercise_dates: int = 50,
+                                     basis: str = "laguerre", degree: int = 3,
+                                     path_dtype: str = "float64", seed: Optional[int] = 42,
+                                     bit_generator: str = "pcg64", antithetic: bool = False,
+                                     **kwargs) -> PricingResult:
+        """Price American or Bermudan exercise by Longstaff-Schwartz regression
+        
+        Exercise is possible on `exercise_dates` equally spaced dates up to
+        expiry; "american" additionally allows exercise today and approaches
+        continuous exercise as the dates are refined. A training pass of
+        `training_simulations` paths (default `simulations`) fits the
+        continuation value at each date by least squares on in-the-money
+        paths, with a `basis` of polynomials of the given degree in S/K. The
+        training paths are stored dates x paths, optionally as float32 to
+        halve the memory, and may take up to MAX_LSM_TRAINING_BYTES.
+        
+        The reported price comes from a separate pass over `simulations`
+        fresh paths that exercise by the fitted rule. That estimate is free
+        of the in-sample (optimistic) bias and, being a feasible policy, is
+        a lower bound up to noise; the in-sample price is reported alongside.
+        """
+        if exercise not in EXERCISE_STYLES[1:]:
+            raise ValueError(f"Longstaff-Schwartz exercise must be one of {EXERCISE_STYLES[1:]}, got '{exercise}'")
+        if basis not in LSM_BASES:
+            raise ValueError(f"Basis must be one of {tuple(LSM_BASES)}, got '{basis}'")
+        if not 1 <= degree <= MAX_LSM_DEGREE:
+            raise ValueError(f"Basis degree must be between 1 and {MAX_LSM_DEGREE}")
+        if not 1 <= exercise_dates <= MAX_TIME_STEPS:
+            raise ValueError(f"Exercise dates must be between 1 and {MAX_TIME_STEPS}")
+        if path_dtype not in PATH_DTYPES:
+            raise ValueError(f"Path dtype must be one of {PATH_DTYPES}, got '{path_dtype}'")
+        
+        training_simulations = training_simulations or simulations
+        training_bytes = exercise_dates * training_simulations * np.dtype(path_dtype).itemsize
+        if training_bytes > MAX_LSM_TRAINING_BYTES:
+            raise ValueError(
+                f"{exercise_dates} exercise dates x {training_simulations} training paths need "
+                f"{training_bytes / 2**20:.0f} MB of {path_dtype} paths, over the "
+                f"{MAX_LSM_TRAINING_BYTES / 2**20:.0f} MB limit; reduce either"
+            )
+        
+        estimate, computation_time = self._time_calculation(
+            self._calculate_longstaff_schwartz, params, simulations, training_simulations,
+            exercise, exercise_dates, basis, degree, path_dtype, seed, bit_generator, antithetic
+        )
+        
+        return PricingResult(
+            price=estimate["price"],
+            computation_time=computation_time,
+            model_name="Monte Carlo",
+            parameters={
+                "simulations": estimate["paths"],
+                "training_simulations": training_simulations,
+                "exercise": exercise,
+                "exercise_dates": exercise_dates,
+                "basis": basis,
+                "degree": degree,
+                "path_dtype": path_dtype,
+                "seed": seed,
+                "bit_generator": bit_generator,
+                "antithetic": antithetic,
+                "in_sample_price": estimate["in_sample_price"]
+            },
+            standard_error=estimate["standard_error"]
+        )
+    
+    def _calculate_longstaff_schwartz(self, params: OptionParameters, simulations: int,
+                                      training_simulations: int, exercise: str, exercise_dates: int,
+                                      basis: str, degree: int, path_dtype: str, seed: Optional[int],
+                                      bit_generator: str, antithetic: bool) -> Dict[str, Any]:
+        """Training regression, then an independent out-of-sample pricing pass"""
         K = params.strike_price
+        phi = 1.0 if params.option_type.lower() == "call" else -1.0
+        discount = math.exp(-params.risk_free_rate * params.time_to_expiry / exercise_dates)
+        vander = LSM_BASES[basis]
+        
+        # Training and pricing paths come from independent children of the seed
+        root = seed_sequence(seed)
+        training_root, pricing_root = child_sequence(root, 0), child_sequence(root, 1)
+        if antithetic:
+            training_simulations += training_simulations % 2
+            simulations += simulations % 2
+        
+        spots = np.empty((exercise_dates, training_simulations), dtype=path_dtype)
+        for block, start in enumerate(range(0, training_simulations, BLOCK_SIZE)):
+            size = min(BLOCK_SIZE, training_simulations - start)
+            rng = block_generator(training_root, block, bit_generator)
+            for date, spot in enumerate(self._lsm_spots(params, rng, size, exercise_dates, antithetic)):
+                spots[date, start:start + size] = spot
+        coefficients, in_sample_price = self._lsm_regression(spots, K, phi, discount, vander, degree)
+        del spots
+        
+        moments = _RunningMoments(1)
+        for block, start in enumerate(range(0, simulations, BLOCK_SIZE)):
+            size = min(BLOCK_SIZE, simulations - start)
+            rng = block_generator(pricing_root, block, bit_generator)
+            values = self._lsm_exercise(params, rng, size, exercise_dates, antithetic,
+                                        coefficients, phi, discount, vander)
+            moments.merge(*_RunningMoments.summarize(self._pair_units(values[np.newaxis, :], antithetic)))
+        
+        mean, covariance, n_units = moments.moments()
+        price = float(mean[0])
+        standard_error = math.sqrt(max(covariance[0, 0], 0.0) / n_units)
+        
+        # American exercise may also happen today
+        intrinsic = max(phi * (params.spot_price - K), 0.0)
+        if exercise == "american" and intrinsic > price:
+            price, standard_error = intrinsic, 0.0
+            in_sample_price = max(in_sample_price, intrinsic)
+        
+        return {
+            "price": price,
+            "standard_error": standard_error,
+            "in_sample_price": in_sample_price,
+            "paths": simulations
+        }
+    
+    def _calculate_price_and_greeks(self, params: OptionParameters, simulations: int,
+                                    seed: Optional[int], bit_generator: str,
+                                    greeks_method: str, antithetic: bool = False,
+                                    control_variate: Optional[str] = None,
+                                    sampler: str = "pseudo", replicates: int = 16,
+                                    target_stderr: Optional[float] = None,
+                                    max_time_ms: Optional[float] = None,
+                                    chunk_size: int = CHUNK_SIZE, workers: int = 1) -> Dict[str, Any]:
+        """Price, Greeks and their standard errors, streamed block by block (see _run)"""
+        if greeks_method not in GREEKS_METHODS:
+            raise ValueError(f"Unknown Greeks method: {greeks_method}")
+        
+        adaptive = target_stderr is not None or max_time_ms is not None
+        plan = self._plan(params, MAX_ADAPTIVE_SIMULATIONS if adaptive else simulations, seed,
+                          bit_generator, antithetic, control_variate, sampler, replicates,
+                          chunk_size, workers, greeks_method=greeks_method,
+                          timed=max_time_ms is not None)
+        control_mean = self._control_mean(params, control_variate) if control_variate else None
+        qmc = plan.replicates is not None
+        
+        paths, units, stopped_by = self._run(
+            plan, len(SAMPLE_ROWS), workers, target_stderr, max_time_ms,
+            lambda paths, units: self._summarize(paths, units, control_mean, qmc)["standard_error"]
+        )
+        estimate = self._summarize(paths, units, control_mean, qmc)
+        estimate["stopped_by"] = stopped_by
+        return estimate
+    
+    def _plan(self, params: OptionParameters, limit: int, seed: Optional[int], bit_generator: str,
+              antithetic: bool, control_variate: Optional[str], sampler: str, replicates: int,
+              chunk_size: int, workers: int, greeks_method: str = "finite_difference",
+              payoffs: Tuple[PathPayoff, ...] = (), time_steps: int = 0,
+              expiries: Tuple[float, ...] = (), strikes: Tuple[np.ndarray, ...] = (),
+              timed: bool = False) -> _SimulationPlan:
+        """Validate the sampling options and lay out the blocks of a run of `limit` paths
+        
+        `timed` marks a run with a time budget, whose time-stepped blocks are
+        kept short enough for the budget to be checked often.
+        """
+        if control_variate is not None and control_variate not in CONTROL_VARIATES:
+            raise ValueError(f"Control variate must be one of {CONTROL_VARIATES}, got '{control_variate}'")
+        if sampler not in SAMPLERS:
+            raise ValueError(f"Sampler must be one of {SAMPLERS}, got '{sampler}'")
+        if sampler == "sobol" and replicates < 2:
+            raise ValueError("Sobol sampling needs at least 2 replicates for an error estimate")
+        if workers < 1:
+            raise ValueError("Workers must be at least 1")
+        
+        block_size = BLOCK_SIZE
+        if timed and time_steps:
+            block_size = min(BLOCK_SIZE, 2 ** math.floor(math.log2(
+                max(TIMED_BLOCK_PATH_STEPS // time_steps, MIN_TIMED_BLOCK)
+            )))
+        
+        if sampler == "sobol":
+            # Power-of-two points per replicate and per block keep every block a balanced net
+            per_replicate = 2 ** math.ceil(math.log2(max(math.ceil(limit / replicates), 2)))
+            block_points = min(per_replicate, 2 ** math.floor(math.log2(max(block_size // replicates, 2))))
+            block_paths = block_points * replicates
+            limit = per_replicate * replicates
+        else:
+            replicates = None
+            block_points = block_paths = block_size
+            if antithetic:
+                limit += limit % 2
+        
+        # Bridged Sobol paths are built whole and chains fan out over many
+        # contracts, so keep those chunks to one block
+        if (replicates and time_steps) or expiries:
+            blocks_per_chunk = 1
+        else:
+            blocks_per_chunk = max(chunk_size // block_paths, 1)
+        
+        return _SimulationPlan(
+            params=params,
+            root=seed_sequence(seed),
+            bit_generator=bit_generator,
+            greeks_method=greeks_method,
+            control_variate=control_variate,
+            antithetic=antithetic,
+            replicates=replicates,
+            limit=limit,
+            block_paths=block_paths,
+            block_points=block_points,
+            blocks_per_chunk=blocks_per_chunk,
+            payoffs=payoffs,
+            time_steps=time_steps,
+            expiries=expiries,
+            strikes=strikes
+        )
+    
+    def _run(self, plan: _SimulationPlan, n_rows: int, workers: int, target_stderr: Optional[float],
+             max_time_ms: Optional[float], error: Callable[[_RunningMoments, Any], float]):
+        """Simulate and reduce the plan's blocks; returns (paths, units, stopped_by)
+        
+        Blocks are handed out to the workers in contiguous ranges, and every
+        block comes back as its own summary. The summaries are merged in
+        block order, so the reduction, and therefore every bit of the
+        result, is the same for any chunking or worker count. Under
+        pseudo-random sampling the independent units are paths (or antithetic
+        pairs); under randomized QMC they are whole replicates.
+        
+        A fixed-count run hands each worker one range. An adaptive run goes
+        in rounds of at most one chunk per worker, and `error` is checked
+        against the target after every block (blocks past the stopping point
+        are discarded). Under a time budget the workers also stop after any
+        block that ends past the deadline, and the result keeps the blocks
+        up to the first range cut short. Rounds start at one block per worker
+        and are then sized from the measured time per block, so a round
+        never plans past the deadline.
+        """
+        rows = n_rows + (1 if plan.control_variate else 0)
+        diagonal = bool(plan.expiries)
+        if plan.replicates:
+            units = _ReplicateMoments(rows, plan.replicates, diagonal)
+        else:
+            units = _RunningMoments(rows, diagonal)
+        paths = _RunningMoments(rows, diagonal)
+        
+        adaptive = target_stderr is not None or max_time_ms is not None
+        n_blocks = math.ceil(plan.limit / plan.block_paths)
+        executor = self._executor(workers) if workers > 1 else None
+        
+        # Serial runs consume one Sobol source front to back
+        if plan.replicates and executor is None:
+            sobol = SobolNormals(plan.root, plan.dimensions, plan.replicates)
+        else:
+            sobol = None
+        
+        # Monotonic time is shared by all processes, so workers can test the deadline
+        deadline = time.monotonic() + max_time_ms / 1000 if max_time_ms is not None else None
+        block_seconds = None
+        stopped_by = "simulations"
+        block = 0
+        
+        while block < n_blocks and stopped_by == "simulations":
+            if not adaptive:
+                per_worker = math.ceil((n_blocks - block) / workers)
+            elif deadline is None:
+                per_worker = plan.blocks_per_chunk
+            elif block_seconds is None:
+                per_worker = 1
+            else:
+                per_worker = int(min(max((deadline - time.monotonic()) / block_seconds, 1), plan.blocks_per_chunk))
+            ranges = [(first, min(per_worker, n_blocks - first))
+                      for first in range(block, min(block + per_worker * workers, n_blocks), per_worker)]
+            
+            round_start = time.monotonic()
+            if executor is None:
+                results = [self._simulate_blocks(plan, first, count, sobol, deadline) for first, count in ranges]
+            else:
+                futures = [executor.submit(self._simulate_blocks, plan, first, count, None, deadline)
+                           for first, count in ranges]
+                results = [future.result() for future in futures]
+            simulated = max(len(summaries) for summaries in results) if executor else sum(map(len, results))
+            block_seconds = (time.monotonic() - round_start) / max(simulated, 1)
+            
+            # Deterministic reduction: always in block order
+            for summaries, (first, count) in zip(results, ranges):
+                for path_summary, unit_summary in summaries:
+                    paths.merge(*path_summary)
+                    units.merge(*unit_summary)
+                    block += 1
+                    
+                    if target_stderr is not None and error(paths, units) <= target_stderr:
+                        stopped_by = "target_stderr"
+                        break
+                if stopped_by == "simulations" and len(summaries) < count:
+                    # Cut short by the deadline; later ranges would leave a gap
+                    stopped_by = "max_time_ms"
+                if stopped_by != "simulations":
+                    break
+            
+            if stopped_by == "simulations" and deadline is not None and time.monotonic() >= deadline:
+                stopped_by = "max_time_ms"
+        
+        return paths, units, stopped_by
+    
+    def _simulate_blocks(self, plan: _SimulationPlan, first_block: int, n_blocks: int,
+                         sobol: Optional[SobolNormals] = None,
+                         deadline: Optional[float] = None) -> List[Tuple[tuple, tuple]]:
+        """Per-block (path, unit) summaries for a contiguous range of blocks
+        
+        Runs in a worker. The range is simulated a chunk at a time, and each
+        block is summarized on its own so the caller can merge in order.
+        Under QMC a `sobol` source already positioned at `first_block` may be
+        passed in to save rebuilding the scrambled engines. With a
+        `deadline` (time.monotonic) blocks are simulated one at a time and
+        the range stops early once it has passed, returning fewer summaries.
+        """
+        if plan.replicates and sobol is None:
+            sobol = SobolNormals(plan.root, plan.dimensions, plan.replicates)
+            sobol.fast_forward(first_block * (plan.block_points // 2 if plan.antithetic else plan.block_points))
+        
+        summaries = []
+        block = first_block
+        end = first_block + n_blocks
+        blocks_per_chunk = 1 if deadline is not None else plan.blocks_per_chunk
+        while block < end and (deadline is None or block == first_block or time.monotonic() < deadline):
+            sizes = [min(plan.block_paths, plan.limit - b * plan.block_paths)
+                     for b in range(block, min(block + blocks_per_chunk, end))]
+            if plan.expiries:
+                row_groups = self._chain_samples(plan, block, sizes, sobol)
+            elif plan.time_steps:
+                row_groups = [self._path_dependent_samples(plan, block, sizes, sobol)]
+            else:
+                if sobol is not None:
+                    z = self._draw_sobol_chunk(sobol, len(sizes), plan.block_points, plan.antithetic)[:, 0]
+                else:
+                    z = self._draw_pseudo_chunk(plan.root, block, sizes, plan.bit_generator, plan.antithetic)
+                row_groups = [self._path_samples(plan.params, z, plan.greeks_method, plan.control_variate)]
+            
+            # Row groups (chain contracts) are summarized as they come and joined per block
+            block_parts = [[] for _ in sizes]
+            for samples in row_groups:
+                offset = 0
+                for parts, size in zip(block_parts, sizes):
+                    parts.append(self._summarize_block(plan, samples[:, offset:offset + size]))
+                    offset += size
+            summaries.extend(self._join_summaries(parts) for parts in block_parts)
+            block += len(sizes)
+        
+        return summaries
+    
+    def _summarize_block(self, plan: _SimulationPlan, observations: np.ndarray) -> Tuple[tuple, tuple]:
+        """(path, unit) summaries of one block's sample rows"""
+        diagonal = bool(plan.expiries)
+        if plan.replicates:
+            unit_summary = _ReplicateMoments.summarize(observations, plan.replicates)
+        else:
+            unit_summary = _RunningMoments.summarize(self._pair_units(observations, plan.antithetic), diagonal)
+        return _RunningMoments.summarize(observations, diagonal), unit_summary
+    
+    def _join_summaries(self, parts: List[Tuple[tuple, tuple]]) -> Tuple[tuple, tuple]:
+        """Stack the summaries of disjoint row groups of one block (diagonal moments only)"""
+        if len(parts) == 1:
+            return parts[0]
+        return tuple(
+            (summaries[0][0], *(np.concatenate(fields) for fields in zip(*(s[1:] for s in summaries))))
+            for summaries in zip(*parts)
+        )
+    
+    def _executor(self, workers: int) -> Executor:
+        """Shared pool of the configured type with the given number of workers"""
+        key = (self.executor, workers)
+        with self._executors_lock:
+            if key not in self._executors:
+                pool = ThreadPoolExecutor if self.executor == "thread" else ProcessPoolExecutor
+                self._executors[key] = pool(max_workers=workers)
+            return self._executors[key]
+    
+    def _draw_pseudo_chunk(self, root: np.random.SeedSequence, first_block: int, sizes,
+                           bit_generator: str, antithetic: bool) -> np.ndarray:
+        """Normals for consecutive blocks, each from its own block stream"""
+        return np.concatenate([
+            self._draw_normals(block_generator(root, first_block + i, bit_generator), size, antithetic)
+            for i, size in enumerate(sizes)
+        ])
+    
+    def _draw_sobol_chunk(self, sobol: SobolNormals, n_blocks: int, block_points: int,
+                          antithetic: bool) -> np.ndarray:
+        """Next blocks of scrambled Sobol normals, (paths, dimensions), each block laid out replicate by replicate"""
+        # One power-of-two draw per block keeps every draw a balanced Sobol net
+        points = block_points // 2 if antithetic else block_points
+        z = np.stack([sobol.draw(points) for _ in range(n_blocks)], axis=1)
+        if antithetic:
+            z = np.concatenate([z, -z], axis=2)
+        return z.transpose(1, 0, 2, 3).reshape(-1, z.shape[-1])
+    
+    def _draw_normals(self, rng: np.random.Generator, simulations: int, antithetic: bool) -> np.ndarray:
+        """Standard normals; antithetic draws are laid out as [z, -z]"""
+        if antithetic:
+            half = rng.standard_normal((simulations + 1) // 2)
+            return np.concatenate([half, -half])
+        return rng.standard_normal(simulations)
+    
+    def _pair_units(self, samples: np.ndarray, antithetic: bool) -> np.ndarray:
+        """Average antithetic partners ([z, -z] layout) into independent pairs"""
+        if not antithetic:
+            return samples
+        half = samples.shape[-1] // 2
+        return 0.5 * (samples[..., :half] + samples[..., half:])
+    
+    def _summarize(self, paths: _RunningMoments, units, control_mean: Optional[float],
+                   qmc: bool) -> Dict[str, Any]:
+        """Estimates and standard errors from the accumulated moments
+        
+        The control variate coefficient is the regression slope of the
+        discounted payoffs on the control (per path under QMC, where there
+        are too few replicates to regress on). The variance reduction factor
+        compares the achieved variance with plain sampling over the same
+        number of paths.
+        """
+        mean, covariance, n_units = units.moments()
+        errors = np.sqrt(np.maximum(np.diag(covariance), 0.0) / n_units)
+        estimate = self._estimate(0, paths, units, control_mean, qmc)
+        
+        greek_rows = slice(1, len(SAMPLE_ROWS))
+        return {
+            **estimate,
+            "paths": paths.count,
+            "greeks": dict(zip(SAMPLE_ROWS[1:], mean[greek_rows].tolist())),
+            "greek_standard_errors": dict(zip(SAMPLE_ROWS[1:], errors[greek_rows].tolist()))
+        }
+    
+    def _summarize_payoffs(self, plan: _SimulationPlan, paths: _RunningMoments, units,
+                           control_mean: Optional[float]) -> Dict[str, Dict[str, Any]]:
+        """Price, standard error and variance reduction of every path-dependent payoff"""
+        return {
+            payoff.name: self._estimate(row, paths, units, control_mean, plan.replicates is not None)
+            for row, payoff in enumerate(plan.payoffs)
+        }
+    
+    def _summarize_chain(self, paths: _RunningMoments, units) -> Dict[str, Any]:
+        """Per-contract estimates and standard errors, rows grouped by expiry"""
+        mean, variance, n_units = units.moments()
+        errors = np.sqrt(np.maximum(variance, 0.0) / n_units).reshape(-1, len(SAMPLE_ROWS))
+        mean = mean.reshape(-1, len(SAMPLE_ROWS))
+        
+        chain = dict(zip(SAMPLE_ROWS, mean.T))
+        chain["standard_error"] = errors[:, 0]
+        chain["greek_standard_errors"] = dict(zip(SAMPLE_ROWS[1:], errors[:, 1:].T))
+        chain["paths"] = paths.count
+        return chain
+    
+    def _estimate(self, row: int, paths: _RunningMoments, units, control_mean: Optional[float],
+                  qmc: bool) -> Dict[str, Any]:
+        """Control-adjusted mean of one sample row with its standard error"""
+        mean, covariance, n_units = units.moments()
+        
+        price = mean[row]
+        variance = covariance[row, row]
+        if control_mean is not None:
+            basis = paths.covariance() if qmc else covariance
+            beta = basis[row, -1] / basis[-1, -1] if basis[-1, -1] > 0 else 0.0
+            price = price - beta * (mean[-1] - control_mean)
+            variance = covariance[row, row] - 2 * beta * covariance[row, -1] + beta**2 * covariance[-1, -1]
+        standard_error = math.sqrt(max(variance, 0.0) / n_units)
+        
+        plain_variance = paths.covariance()[row, row] / paths.count
+        reduction = float(plain_variance / standard_error**2) if standard_error > 0 else None
+        
+        return {
+            "price": float(price),
+            "standard_error": standard_error,
+            "variance_reduction_factor": reduction
+        }
+    
+    def _path_samples(self, params: OptionParameters, z: np.ndarray, greeks_method: str,
+                      control_variate: Optional[str]) -> np.ndarray:
+        """Per-path sample rows (SAMPLE_ROWS, then the control if any) for one chunk"""
+        if greeks_method == "pathwise":
+            samples = self._pathwise_samples(params, z)
+        else:
+            samples = self._finite_difference_samples(params, z)
+        
+        if control_variate is None:
+            return samples
+        return np.vstack([samples, self._control_samples(params, z, control_variate)])
+    
+    def _control_mean(self, params: OptionParameters, control_variate: str) -> float:
+        """Exact expectation of the control"""
+        if control_variate == "terminal_spot":
+            return params.spot_price * math.exp(-params.dividend_yield * params.time_to_expiry)
+        return self._black_scholes._calculate_price_and_greeks(params, greeks=())[0]
+    
+    def _control_samples(self, params: OptionParameters, z: np.ndarray, control_variate: str) -> np.ndarray:
+        """Per-path control values (see _control_mean for their expectation)"""
+        discount, ST = self._terminal_prices(params, z)
+        return self._terminal_control(params, discount, ST, control_variate)
+    
+    def _terminal_control(self, params: OptionParameters, discount: float, ST: np.ndarray,
+                          control_variate: str) -> np.ndarray:
+        """Control values from the terminal stock prices"""
+        if control_variate == "terminal_spot":
+            return discount * ST
+        
+        # Vanilla payoff against its closed form: a strong control for
+        # path-dependent payoffs (calculate rejects it for the European
+        # payoff, where it is the estimator itself)
+        phi = 1.0 if params.option_type.lower() == "call" else -1.0
+        return discount * np.maximum(phi * (ST - params.strike_price), 0)
+    
+    def _terminal_prices(self, params: OptionParameters, z: np.ndarray) -> Tuple[float, np.ndarray]:
+        """Discount factor and terminal stock prices under risk-neutral GBM"""
+        S = params.spot_price
         T = params.time_to_expiry
         r = params.risk_free_rate
         q = params.dividend_yield
         sigma = params.volatility
         
-        # Generate random paths using geometric Brownian motion
-        z = np.random.standard_normal(simulations)
-        
-        # Calculate final stock prices
         ST = S * np.exp((r - q - 0.5 * sigma**2) * T + sigma * math.sqrt(T) * z)
+        return math.exp(-r * T), ST
+    
+    def _chain_samples(self, plan: _SimulationPlan, first_block: int, sizes,
+                       sobol: Optional[SobolNormals]):
+        """Per-path samples of the chain, yielded CHAIN_BATCH contracts at a time
+        
+        The underlying is simulated once to every expiry, each level built on
+        the previous one: pseudo-random blocks add an independent increment
+        per expiry, Sobol blocks fill the expiries by Brownian bridge. Every
+        contract at an expiry is then evaluated from the same terminal
+        samples with a broadcast (strikes x paths) payoff matrix. Rows are
+        contract-major, SAMPLE_ROWS per contract.
+        """
+        expiries = np.asarray(plan.expiries)
+        if sobol is not None:
+            z = self._draw_sobol_chunk(sobol, len(sizes), plan.block_points, plan.antithetic)
+            levels = brownian_bridge(z, expiries).T
+        else:
+            generators = [block_generator(plan.root, first_block + i, plan.bit_generator)
+                          for i in range(len(sizes))]
+            increments = np.stack([
+                np.concatenate([self._draw_normals(rng, size, plan.antithetic)
+                                for rng, size in zip(generators, sizes)])
+                for _ in expiries
+            ])
+            levels = np.cumsum(np.sqrt(np.diff(expiries, prepend=0.0))[:, np.newaxis] * increments, axis=0)
+        
+        for T, level, strikes in zip(plan.expiries, levels, plan.strikes):
+            z = level / math.sqrt(T)
+            for start in range(0, len(strikes), CHAIN_BATCH):
+                contracts = replace(plan.params, strike_price=strikes[start:start + CHAIN_BATCH],
+                                    time_to_expiry=T)
+                samples = self._path_samples(contracts, z, plan.greeks_method, None)
+                yield samples.transpose(1, 0, 2).reshape(-1, z.size)
+    
+    def _path_dependent_samples(self, plan: _SimulationPlan, first_block: int, sizes,
+                                sobol: Optional[SobolNormals]) -> np.ndarray:
+        """Discounted per-path payoffs (one row per payoff, then the control if any)
+        
+        Paths advance one monitoring date at a time with the exact GBM step,
+        vectorized across the chunk; only the running sums and extremes are
+        kept, never the paths x steps matrix. Pseudo-random blocks draw one
+        normal per path and step from their own stream. Sobol blocks are
+        built by Brownian bridge so the leading QMC dimensions set the
+        terminal value and the coarse shape of each path.
+        """
+        params = plan.params
+        S = params.spot_price
+        T = params.time_to_expiry
+        r = params.risk_free_rate
+        q = params.dividend_yield
+        sigma = params.volatility
+        phi = 1.0 if params.option_type.lower() == "call" else -1.0
+        
+        steps = plan.time_steps
+        dt = T / steps
+        drift = (r - q - 0.5 * sigma**2) * dt
+        diffusion = sigma * math.sqrt(dt)
+        
+        if sobol is not None:
+            z = self._draw_sobol_chunk(sobol, len(sizes), plan.block_points, plan.antithetic)
+            levels = brownian_bridge(z, dt * np.arange(1, steps + 1))
+            step_normals = (np.diff(levels, axis=-1, prepend=0.0) / math.sqrt(dt)).T
+        else:
+            generators = [block_generator(plan.root, first_block + i, plan.bit_generator)
+                          for i in range(len(sizes))]
+            step_normals = (
+                np.concatenate([self._draw_normals(rng, size, plan.antithetic)
+                                for rng, size in zip(generators, sizes)])
+                for _ in range(steps)
+            )
+        
+        n = sum(sizes)
+        log_spot = np.full(n, math.log(S))
+        total = np.zeros(n)
+        log_total = np.zeros(n)
+        minimum = np.full(n, S, dtype=np.float64)
+        maximum = np.full(n, S, dtype=np.float64)
+        
+        for z in step_normals:
+            log_spot += drift + diffusion * z
+            spot = np.exp(log_spot)
+            total += spot
+            log_total += log_spot
+            np.minimum(minimum, spot, out=minimum)
+            np.maximum(maximum, spot, out=maximum)
+        
+        stats = PathStatistics(
+            terminal=spot,
+            average=total / steps,
+            geometric_average=np.exp(log_total / steps),
+            minimum=minimum,
+            maximum=maximum
+        )
+        discount = math.exp(-r * T)
+        rows = [discount * payoff.evaluate(stats, params.strike_price, phi) for payoff in plan.payoffs]
+        if plan.control_variate:
+            rows.append(self._terminal_control(params, discount, spot, plan.control_variate))
+        return np.stack(rows)
+    
+    def _scenario_payoffs(self, params: OptionParameters, z: np.ndarray,
+                          spot, time, rate, vol) -> Tuple[np.ndarray, np.ndarray]:
+        """Discount factors and undiscounted per-path payoffs, one row per scenario
+        
+        Scenario parameters may be scalars or 1-D arrays of equal length. All
+        scenarios are evaluated in a single broadcast expression against the
+        shared normal vector `z`. A vector of strikes (chain mode) adds a
+        leading strike axis to the payoffs.
+        """
+        spot, time, rate, vol = (
+            np.atleast_1d(np.asarray(a, dtype=np.float64))[:, np.newaxis]
+            for a in (spot, time, rate, vol)
+        )
+        K = params.strike_price
+        if np.ndim(K):
+            K = np.asarray(K)[:, np.newaxis, np.newaxis]
+        q = params.dividend_yield
+        
+        # Calculate final stock prices, one row per scenario
+        ST = spot * np.exp((rate - q - 0.5 * vol**2) * time + vol * np.sqrt(time) * z)
         
         # Calculate payoffs
         if params.option_type.lower() == "call":
@@ -50,58 +1073,152 @@ class MonteCarloModel(BasePricingModel):
         else:  # put
             payoffs = np.maximum(0, K - ST)
         
-        # Calculate option price as discounted expected payoff
-        price = math.exp(-r * T) * np.mean(payoffs)
+        return np.exp(-rate[:, 0] * time[:, 0]), payoffs
+    
+    def _finite_difference_samples(self, params: OptionParameters, z: np.ndarray) -> np.ndarray:
+        """Per-path price and finite-difference Greeks (rows follow SAMPLE_ROWS)
         
-        return price
+        Common random numbers: the base and all bumped scenarios are priced
+        against the same normals in one batched pass, so each Greek is the
+        mean of per-path differences and its standard error reflects the
+        noise that common random numbers leave behind.
+        """
+        S = params.spot_price
+        T = params.time_to_expiry
+        r = params.risk_free_rate
+        sigma = params.volatility
+        
+        # Bump sizes: 1% spot, 1 day, 1 vol point, 1% rate
+        dS = S * 0.01
+        dt = 1/365
+        dv = 0.01
+        dr = 0.01
+        T_theta = max(T - dt, dt)
+        
+        # Scenarios: base, spot up, spot down, theta, vega, rho
+        discount, payoffs = self._scenario_payoffs(
+            params, z,
+            spot=[S, S + dS, S - dS, S, S, S],
+            time=[T, T, T, T_theta, T, T],
+            rate=[r, r, r, r, r, r + dr],
+            vol=[sigma, sigma, sigma, sigma, sigma + dv, sigma]
+        )
+        base, up, down, theta_paths, vega_paths, rho_paths = np.moveaxis(discount[:, np.newaxis] * payoffs, -2, 0)
+        
+        # One bump of 1 vol point / 1% rate already is the per-1% sensitivity
+        return np.stack([
+            base,
+            (up - down) / (2 * dS),
+            (up - 2 * base + down) / (dS ** 2),
+            theta_paths - base,  # Per day change
+            vega_paths - base,
+            rho_paths - base
+        ])
     
-    def _calculate_greeks_finite_diff(self, params: OptionParameters, simulations: int) -> Dict[str, float]:
-        """Calculate Greeks using finite differences"""
-        # Use same seed for all calculations to reduce noise
-        seed = 42
+    def _pathwise_samples(self, params: OptionParameters, z: np.ndarray) -> np.ndarray:
+        """Per-path price, pathwise delta/vega/rho and likelihood-ratio gamma/theta
+        
+        Everything is estimated from the terminal prices that produce the
+        price itself. The payoff is differentiated along each path where that
+        is valid (first-order Greeks); for gamma and theta the kink makes the
+        pathwise derivative useless, so the payoff is weighted with the score
+        of the lognormal density instead. Rows follow SAMPLE_ROWS.
+        """
+        S = params.spot_price
+        K = params.strike_price
+        if np.ndim(K):  # Chain mode: one row of paths per strike
+            K = np.asarray(K)[:, np.newaxis]
+        T = params.time_to_expiry
+        r = params.risk_free_rate
+        q = params.dividend_yield
+        sigma = params.volatility
+        phi = 1.0 if params.option_type.lower() == "call" else -1.0
         
-        # Base price
-        price_base = self._calculate_price(params, simulations, seed)
+        sqrt_T = math.sqrt(T)
+        drift = r - q - 0.5 * sigma**2
+        discount, ST = self._terminal_prices(params, z)
+        payoff = np.maximum(phi * (ST - K), 0)
         
-        # Delta: finite difference with 1% spot price change
-        dS = params.spot_price * 0.01
-        params_up = OptionParameters(**params.__dict__)
-        params_down = OptionParameters(**params.__dict__)
-        params_up.spot_price += dS
-        params_down.spot_price -= dS
+        # ST * dpayoff/dST: phi * ST in the money, zero otherwise
+        payoff_slope = np.where(phi * (ST - K) > 0, phi * ST, 0.0)
         
-        price_up = self._calculate_price(params_up, simulations, seed)
-        price_down = self._calculate_price(params_down, simulations, seed)
-        delta = (price_up - price_down) / (2 * dS)
+        return discount * np.stack([
+            payoff,
+            payoff_slope / S,
+            payoff * ((z * z - 1) / (S**2 * sigma**2 * T) - z / (S**2 * sigma * sqrt_T)),
+            -payoff * (z * drift / (sigma * sqrt_T) + (z * z - 1) / (2 * T) - r) / 365,  # Per day
+            payoff_slope * (sqrt_T * z - sigma * T) / 100,  # Per 1% volatility
+            T * (payoff_slope - payoff) / 100  # Per 1% rate
+        ])
+    
+    def _lsm_spots(self, params: OptionParameters, rng: np.random.Generator, size: int,
+                   exercise_dates: int, antithetic: bool):
+        """Stock prices at each exercise date, one vector of `size` paths at a time"""
+        T = params.time_to_expiry
+        dt = T / exercise_dates
+        drift = (params.risk_free_rate - params.dividend_yield - 0.5 * params.volatility**2) * dt
+        diffusion = params.volatility * math.sqrt(dt)
         
-        # Gamma: second derivative
-        gamma = (price_up - 2 * price_base + price_down) / (dS ** 2)
+        log_spot = np.full(size, math.log(params.spot_price))
+        for _ in range(exercise_dates):
+            log_spot += drift + diffusion * self._draw_normals(rng, size, antithetic)
+            yield np.exp(log_spot)
+    
+    def _lsm_regression(self, spots: np.ndarray, K: float, phi: float, discount: float,
+                        vander: Callable, degree: int) -> Tuple[np.ndarray, float]:
+        """Backward induction over stored training paths (dates x paths)
         
-        # Theta: finite difference with time (1 day change)
-        dt = 1/365
-        params_theta = OptionParameters(**params.__dict__)
-        params_theta.time_to_expiry = max(params.time_to_expiry - dt, dt)
-        price_theta = self._calculate_price(params_theta, simulations, seed)
-        theta = (price_theta - price_base)  # Per day change
+        At each date the discounted realized cash flows of the in-the-money
+        paths are regressed on the basis; paths whose exercise value beats
+        the fitted continuation value exercise there. Returns the
+        coefficients per date (NaN where too few paths were in the money to
+        fit, meaning no exercise) and the in-sample price.
+        """
+        exercise_dates = spots.shape[0]
+        coefficients = np.full((exercise_dates - 1, degree + 1), np.nan)
+        cashflow = np.maximum(phi * (spots[-1].astype(np.float64) - K), 0)
         
-        # Vega: finite difference with volatility (1% change)
-        dv = 0.01
-        params_vega = OptionParameters(**params.__dict__)
-        params_vega.volatility += dv
-        price_vega = self._calculate_price(params_vega, simulations, seed)
-        vega = (price_vega - price_base) / 100  # Convert to 1% change
+        for date in range(exercise_dates - 2, -1, -1):
+            cashflow *= discount
+            spot = spots[date].astype(np.float64)
+            exercise_value = np.maximum(phi * (spot - K), 0)
+            itm = np.flatnonzero(exercise_value > 0)
+            if itm.size <= degree:
+                continue
+            
+            X = vander(spot[itm] / K, degree)
+            beta = np.linalg.lstsq(X, cashflow[itm], rcond=None)[0]
+            coefficients[date] = beta
+            exercise_now = itm[exercise_value[itm] > X @ beta]
+            cashflow[exercise_now] = exercise_value[exercise_now]
         
-        # Rho: finite difference with interest rate (1% change)
-        dr = 0.01
-        params_rho = OptionParameters(**params.__dict__)
-        params_rho.risk_free_rate += dr
-        price_rho = self._calculate_price(params_rho, simulations, seed)
-        rho = (price_rho - price_base) / 100  # Convert to 1% change
+        return coefficients, float(discount * np.mean(cashflow))
+    
+    def _lsm_exercise(self, params: OptionParameters, rng: np.random.Generator, size: int,
+                      exercise_dates: int, antithetic: bool, coefficients: np.ndarray,
+                      phi: float, discount: float, vander: Callable) -> np.ndarray:
+        """Discounted cash flows of fresh paths exercised by the fitted rule
         
-        return {
-            "delta": delta,
-            "gamma": gamma,
-            "theta": theta,
-            "vega": vega,
-            "rho": rho
-        }
\ No newline at end of file
+        Paths are streamed date by date; only the live/exercised state is
+        kept, so this pass needs no path storage.
+        """
+        K = params.strike_price
+        degree = coefficients.shape[1] - 1
+        values = np.zeros(size)
+        alive = np.ones(size, dtype=bool)
+        
+        for date, spot in enumerate(self._lsm_spots(params, rng, size, exercise_dates, antithetic)):
+            exercise_value = np.maximum(phi * (spot - K), 0)
+            if date == exercise_dates - 1:
+                values[alive] = discount ** exercise_dates * exercise_value[alive]
+                break
+            if np.isnan(coefficients[date, 0]):
+                continue
+            
+            candidates = np.flatnonzero(alive & (exercise_value > 0))
+            continuation = vander(spot[candidates] / K, degree) @ coefficients[date]
+            exercise_now = candidates[exercise_value[candidates] > continuation]
+            values[exercise_now] = discount ** (date + 1) * exercise_value[exercise_now]
+            alive[exercise_now] = False
+        
+        return values
\ No newline at end of file
@@ -0,0 +1,129 @@
+import numpy as np
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Dict, Type
+
+AVERAGES = ("arithmetic", "geometric")
+BARRIER_DIRECTIONS = ("up", "down")
+BARRIER_KNOCKS = ("in", "out")
+LOOKBACK_STRIKES = ("floating", "fixed")
+
+
+@dataclass
+class PathStatistics:
+    """Per-path statistics accumulated while stepping through the paths
+    
+    Averages run over the monitoring dates t_1..t_n; the extremes also
+    include the spot at t_0, so a barrier already breached at inception
+    counts as hit.
+    """
+    terminal: np.ndarray
+    average: np.ndarray
+    geometric_average: np.ndarray
+    minimum: np.ndarray
+    maximum: np.ndarray
+
+
+class PathPayoff(ABC):
+    """Payoff evaluated from streamed path statistics
+    
+    Plugins never see the paths themselves, so any number of them can be
+    priced from one simulation pass without storing paths x steps.
+    """
+    
+    @property
+    @abstractmethod
+    def name(self) -> str:
+        """Unique label of the payoff in results"""
+        pass
+    
+    @abstractmethod
+    def evaluate(self, stats: PathStatistics, strike: float, phi: float) -> np.ndarray:
+        """Undiscounted per-path payoffs; phi is +1 for calls and -1 for puts"""
+        pass
+
+
+class AsianPayoff(PathPayoff):
+    """Average-price option on the arithmetic or geometric mean of the monitoring dates"""
+    
+    def __init__(self, average: str = "arithmetic"):
+        if average not in AVERAGES:
+            raise ValueError(f"Average must be one of {AVERAGES}, got '{average}'")
+        self.average = average
+    
+    @property
+    def name(self) -> str:
+        return f"asian_{self.average}"
+    
+    def evaluate(self, stats: PathStatistics, strike: float, phi: float) -> np.ndarray:
+        average = stats.average if self.average == "arithmetic" else stats.geometric_average
+        return np.maximum(phi * (average - strike), 0)
+
+
+class BarrierPayoff(PathPayoff):
+    """Vanilla payoff knocked in or out by a discretely monitored barrier"""
+    
+    def __init__(self, barrier: float, direction: str = "up", knock: str = "out"):
+        if barrier is None or barrier <= 0:
+            raise ValueError("Barrier must be positive")
+        if direction not in BARRIER_DIRECTIONS:
+            raise ValueError(f"Barrier direction must be one of {BARRIER_DIRECTIONS}, got '{direction}'")
+        if knock not in BARRIER_KNOCKS:
+            raise ValueError(f"Barrier knock must be one of {BARRIER_KNOCKS}, got '{knock}'")
+        self.barrier = float(barrier)
+        self.direction = direction
+        self.knock = knock
+    
+    @property
+    def name(self) -> str:
+        return f"barrier_{self.direction}_and_{self.knock}_{self.barrier:g}"
+    
+    def evaluate(self, stats: PathStatistics, strike: float, phi: float) -> np.ndarray:
+        if self.direction == "up":
+            hit = stats.maximum >= self.barrier
+        else:
+            hit = stats.minimum <= self.barrier
+        alive = hit if self.knock == "in" else ~hit
+        return np.where(alive, np.maximum(phi * (stats.terminal - strike), 0), 0.0)
+
+
+class LookbackPayoff(PathPayoff):
+    """Lookback on the path extremes
+    
+    Floating strike: the call pays S_T - min, the put max - S_T. Fixed
+    strike: the call pays max(max - K, 0), the put max(K - min, 0).
+    """
+    
+    def __init__(self, strike_type: str = "floating"):
+        if strike_type not in LOOKBACK_STRIKES:
+            raise ValueError(f"Lookback strike must be one of {LOOKBACK_STRIKES}, got '{strike_type}'")
+        self.strike_type = strike_type
+    
+    @property
+    def name(self) -> str:
+        return f"lookback_{self.strike_type}"
+    
+    def evaluate(self, stats: PathStatistics, strike: float, phi: float) -> np.ndarray:
+        if self.strike_type == "floating":
+            return phi * stats.terminal - (stats.minimum if phi > 0 else -stats.maximum)
+        extreme = stats.maximum if phi > 0 else stats.minimum
+        return np.maximum(phi * (extreme - strike), 0)
+
+
+PATH_PAYOFFS: Dict[str, Type[PathPayoff]] = {
+    "asian": AsianPayoff,
+    "barrier": BarrierPayoff,
+    "lookback": LookbackPayoff,
+}
+
+
+def build_payoff(spec: Dict[str, Any]) -> PathPayoff:
+    """Payoff plugin from a spec such as {"type": "barrier", "barrier": 120, "knock": "in"}"""
+    spec = dict(spec)
+    payoff_type = spec.pop("type", None)
+    if payoff_type not in PATH_PAYOFFS:
+        raise ValueError(f"Payoff type must be one of {tuple(PATH_PAYOFFS)}, got '{payoff_type}'")
+    try:
+        return PATH_PAYOFFS[payoff_type](**spec)
+    except TypeError as e:
+        raise ValueError(f"Invalid {payoff_type} payoff: {e}")
\ No newline at end of file
@@ -1,48 +1,134 @@
-from typing import List, Dict, Any
-from .base_model import OptionParameters, PricingResult
+import time
+import logging
+import functools
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from typing import List, Dict, Any, Callable, Optional, Tuple, Union
+from ..config import settings
+from .base_model import ModelFailure, OptionParameters, PricingResult
+from .cache import (
+    PricingCache, RedisCache, SingleFlight, TieredCache, canonical_key, quantize, quantize_params, redis_client
+)
 from .black_scholes import BlackScholesModel
 from .binomial_tree import BinomialTreeModel
 from .monte_carlo import MonteCarloModel
+from .implied_vol import ImpliedVolatilitySolver
+
+logger = logging.getLogger(__name__)
 
 class PricingEngine:
     """Central engine that orchestrates all pricing models"""
     
-    def __init__(self):
+    def __init__(self, max_workers: Optional[int] = None,
+                 cache: Optional[Union[PricingCache, TieredCache]] = None):
         self.models = {
             'black_scholes': BlackScholesModel(),
             'binomial': BinomialTreeModel(),
             'monte_carlo': MonteCarloModel()
         }
+        self.implied_vol_solver = ImpliedVolatilitySolver(self.models['black_scholes'])
+        
+        # Shared by all requests, so concurrent model runs stay bounded
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or settings.PRICING_ENGINE_WORKERS,
+            thread_name_prefix="pricing-model"
+        )
+        
+        if cache is None and settings.PRICING_CACHE_ENABLED:
+            cache = PricingCache(
+                max_entries=settings.PRICING_CACHE_MAX_ENTRIES,
+                max_bytes=settings.PRICING_CACHE_MAX_BYTES,
+                ttl_seconds=settings.PRICING_CACHE_TTL_SECONDS,
+                quantize_digits=settings.PRICING_CACHE_QUANTIZE_DIGITS
+            )
+            client = redis_client(settings.REDIS_URL, settings.PRICING_CACHE_REDIS_TIMEOUT_SECONDS) \
+                if settings.PRICING_CACHE_REDIS_ENABLED else None
+            if client is not None:
+                cache = TieredCache(cache, RedisCache(
+                    client,
+                    ttl_seconds=settings.PRICING_CACHE_REDIS_TTL_SECONDS,
+                    retry_seconds=settings.PRICING_CACHE_REDIS_RETRY_SECONDS
+                ))
+        self.cache = cache
+        # Identical requests arriving while one is being priced wait for its result
+        self._flights = SingleFlight()
     
     def calculate_all_models(self, 
                            params: OptionParameters,
                            binomial_steps: int = 100,
-                           monte_carlo_simulations: int = 10000) -> List[PricingResult]:
-        """Calculate option price using all available models"""
+                           monte_carlo_simulations: int = 10000,
+                           exercise: str = "european",
+                           binomial_options: Optional[Dict[str, Any]] = None,
+                           monte_carlo_options: Optional[Dict[str, Any]] = None,
+                           timeouts: Optional[Dict[str, float]] = None) -> Tuple[List[PricingResult], List[ModelFailure]]:
+        """Calculate option price using all available models
+        
+        `exercise` applies to the binomial tree and to Monte Carlo (early
+        exercise by Longstaff-Schwartz); Black-Scholes always prices European
+        exercise. `binomial_options` are passed through to the binomial model
+        (tree, richardson, tolerance) and `monte_carlo_options` to the Monte
+        Carlo model (seed, bit_generator, exercise_dates, basis, ...).
+        
+        The models run concurrently on the engine's shared pool (NumPy
+        releases the GIL in the heavy loops). Each model gets its own
+        timeout in seconds, from `timeouts` keyed by model name or
+        settings.MODEL_TIMEOUT_SECONDS, counted from submission. Returns the
+        results that completed, in model order, and a failure record for
+        every model that raised or timed out. A timed-out model keeps its
+        worker until it finishes; its result is discarded. Cached results
+        for all models are looked up in one multi-get before anything is
+        submitted, and the fresh results are written back in one batch.
+        """
+        params = self._quantize(params)
+        calls = {
+            'black_scholes': (self.models['black_scholes'].calculate, params, {}),
+            'binomial': (self.models['binomial'].calculate, params, {
+                "steps": binomial_steps, "exercise": exercise, **(binomial_options or {})
+            }),
+            'monte_carlo': (self.models['monte_carlo'].calculate, params, {
+                "simulations": monte_carlo_simulations, "exercise": exercise, **(monte_carlo_options or {})
+            })
+        }
+        
+        keys = {
+            name: self._cache_key(name, {"params": model_params, **kwargs})
+            for name, (func, model_params, kwargs) in calls.items()
+        }
+        cached = self.cache.get_many(key for key in keys.values() if key is not None) if self.cache else {}
+        
+        start_time = time.monotonic()
+        futures = {
+            name: self._executor.submit(
+                self._coalesced, keys[name], functools.partial(func, model_params, **kwargs), store=False
+            )
+            for name, (func, model_params, kwargs) in calls.items()
+            if keys[name] not in cached
+        }
+        
         results = []
+        failures = []
+        computed = {}
+        for name in calls:
+            if keys[name] in cached:
+                results.append(cached[keys[name]])
+                continue
+            future = futures[name]
+            timeout = (timeouts or {}).get(name, settings.MODEL_TIMEOUT_SECONDS)
+            try:
+                results.append(future.result(timeout=max(start_time + timeout - time.monotonic(), 0)))
+                if keys[name] is not None:
+                    computed[keys[name]] = results[-1]
+            except TimeoutError:
+                future.cancel()
+                logger.warning("%s calculation timed out after %.3gs", name, timeout)
+                failures.append(ModelFailure(name, f"Timed out after {timeout:g}s", timed_out=True))
+            except Exception as e:
+                logger.exception("%s calculation failed", name)
+                failures.append(ModelFailure(name, str(e)))
         
-        # Black-Scholes (fastest, analytical)
-        try:
-            bs_result = self.models['black_scholes'].calculate(params)
-            results.append(bs_result)
-        except Exception as e:
-            print(f"Black-Scholes calculation failed: {e}")
-        
-        # Binomial Tree
-        try:
-            binomial_result = self.models['binomial'].calculate(params, steps=binomial_steps)
-            results.append(binomial_result)
-        except Exception as e:
-            print(f"Binomial tree calculation failed: {e}")
-        
-        # Monte Carlo
-        try:
-            mc_result = self.models['monte_carlo'].calculate(params, simulations=monte_carlo_simulations)
-            results.append(mc_result)
-        except Exception as e:
-            print(f"Monte Carlo calculation failed: {e}")
-        
-        return results
+        if self.cache is not None and computed:
+            self.cache.put_many(computed)
+        return results, failures
     
     def calculate_single_model(self, 
                              model_name: str, 
@@ -52,7 +138,203 @@ class PricingEngine:
         if model_name not in self.models:
             raise ValueError(f"Unknown model: {model_name}")
         
-        return self.models[model_name].calculate(params, **kwargs)
+        params = self._quantize(params)
+        return self._memoized(
+            model_name, {"params": params, **kwargs},
+            functools.partial(self.models[model_name].calculate, params, **kwargs)
+        )
+    
+    def calculate_batch(self,
+                        model_name: str,
+                        spot_price,
+                        strike_price,
+                        time_to_expiry,
+                        risk_free_rate,
+                        volatility,
+                        dividend_yield=0.0,
+                        option_type: Union[str, List[str], np.ndarray] = "call",
+                        **kwargs) -> Dict[str, np.ndarray]:
+        """Calculate prices and Greeks for a batch of contracts
+        
+        Inputs are scalars or arrays that broadcast against each other.
+        Models exposing a vectorized `price_batch` are priced in a single
+        pass; the others fall back to pricing contract by contract.
+        """
+        if model_name not in self.models:
+            raise ValueError(f"Unknown model: {model_name}")
+        
+        is_call = np.char.lower(np.asarray(option_type, dtype=str)) == "call"
+        S, K, T, r, q, sigma, is_call = np.broadcast_arrays(
+            np.asarray(spot_price, dtype=np.float64),
+            np.asarray(strike_price, dtype=np.float64),
+            np.asarray(time_to_expiry, dtype=np.float64),
+            np.asarray(risk_free_rate, dtype=np.float64),
+            np.asarray(dividend_yield, dtype=np.float64),
+            np.asarray(volatility, dtype=np.float64),
+            is_call
+        )
+        if self.cache is not None and self.cache.quantize_digits is not None:
+            S, K, T, r, q, sigma = (quantize(a, self.cache.quantize_digits) for a in (S, K, T, r, q, sigma))
+        
+        inputs = {"S": S, "K": K, "T": T, "r": r, "q": q, "sigma": sigma, "is_call": is_call, **kwargs}
+        return self._memoized(
+            f"batch:{model_name}", inputs,
+            functools.partial(self._price_batch, self.models[model_name], S, K, T, r, q, sigma, is_call, **kwargs)
+        )
+    
+    def _price_batch(self, model, S, K, T, r, q, sigma, is_call, **kwargs) -> Dict[str, np.ndarray]:
+        if hasattr(model, "price_batch"):
+            return model.price_batch(S, K, T, r, q, sigma, is_call, **kwargs)
+        
+        # Fallback: price each contract individually
+        outputs = {"price": np.zeros(S.shape)}
+        for idx in np.ndindex(S.shape):
+            params = OptionParameters(
+                spot_price=float(S[idx]),
+                strike_price=float(K[idx]),
+                time_to_expiry=float(T[idx]),
+                risk_free_rate=float(r[idx]),
+                volatility=float(sigma[idx]),
+                dividend_yield=float(q[idx]),
+                option_type="call" if is_call[idx] else "put"
+            )
+            result = model.calculate(params, **kwargs)
+            outputs["price"][idx] = result.price
+            for greek, value in (result.greeks or {}).items():
+                outputs.setdefault(greek, np.zeros(S.shape))[idx] = value
+        
+        return outputs
+    
+    def calculate_chain(self,
+                        model_name: str,
+                        params: OptionParameters,
+                        strikes,
+                        **kwargs) -> Dict[str, Any]:
+        """Price one underlying/expiry across a vector of strikes
+        
+        Models with a native chain mode (shared lattice, shared Monte Carlo
+        paths) use it; the others are priced as a batch over the strikes.
+        """
+        if model_name not in self.models:
+            raise ValueError(f"Unknown model: {model_name}")
+        
+        model = self.models[model_name]
+        if hasattr(model, "calculate_chain"):
+            params = self._quantize(params)
+            if self.cache is not None and self.cache.quantize_digits is not None:
+                strikes = quantize(np.atleast_1d(np.asarray(strikes, dtype=np.float64)), self.cache.quantize_digits)
+            return self._memoized(
+                f"chain:{model_name}", {"params": params, "strikes": strikes, **kwargs},
+                functools.partial(model.calculate_chain, params, strikes, **kwargs)
+            )
+        
+        start_time = time.time()
+        # Copy: the batch result may be the cached object itself
+        chain = dict(self.calculate_batch(
+            model_name,
+            spot_price=params.spot_price,
+            strike_price=np.atleast_1d(strikes),
+            time_to_expiry=params.time_to_expiry,
+            risk_free_rate=params.risk_free_rate,
+            volatility=params.volatility,
+            dividend_yield=params.dividend_yield,
+            option_type=params.option_type,
+            **kwargs
+        ))
+        chain["computation_time"] = time.time() - start_time
+        return chain
+    
+    def calculate_path_dependent(self,
+                                 params: OptionParameters,
+                                 payoffs: List[Any],
+                                 **kwargs) -> Dict[str, Any]:
+        """Price path-dependent payoffs (Asian, barrier, lookback) in one Monte Carlo pass"""
+        params = self._quantize(params)
+        return self._memoized(
+            "path_dependent:monte_carlo", {"params": params, "payoffs": payoffs, **kwargs},
+            functools.partial(self.models['monte_carlo'].calculate_path_dependent, params, payoffs, **kwargs)
+        )
+    
+    def calculate_implied_volatility(self,
+                                     market_price,
+                                     spot_price,
+                                     strike_price,
+                                     time_to_expiry,
+                                     risk_free_rate,
+                                     dividend_yield=0.0,
+                                     option_type: Union[str, List[str], np.ndarray] = "call") -> Dict[str, np.ndarray]:
+        """Invert market prices to Black-Scholes implied volatilities"""
+        is_call = np.char.lower(np.asarray(option_type, dtype=str)) == "call"
+        return self.implied_vol_solver.solve(
+            market_price, spot_price, strike_price, time_to_expiry,
+            risk_free_rate, dividend_yield, is_call
+        )
+    
+    def cache_stats(self) -> Optional[Dict[str, Any]]:
+        """Hit/miss/eviction counters of the cache, with the Redis tier's under "l2" (None when disabled)"""
+        return self.cache.stats() if self.cache is not None else None
+    
+    def coalescing_stats(self) -> Dict[str, int]:
+        """Computations run, and computations saved by joining an identical in-flight one"""
+        return self._flights.stats()
+    
+    def _quantize(self, params: OptionParameters) -> OptionParameters:
+        """Market inputs rounded as configured, so nearby requests share a cache entry"""
+        return quantize_params(params, self.cache.quantize_digits if self.cache is not None else None)
+    
+    def _memoized(self, namespace: str, inputs: Dict[str, Any], compute: Callable[[], Any]) -> Any:
+        """Result of `compute`, memoized on a canonical hash of the namespace and inputs"""
+        key = self._cache_key(namespace, inputs)
+        if key is None:
+            return compute()
+        if self.cache is not None:
+            missing = object()
+            value = self.cache.get(key, missing)
+            if value is not missing:
+                return value
+        return self._coalesced(key, compute)
+    
+    def _coalesced(self, key: Optional[str], compute: Callable[[], Any], store: bool = True) -> Any:
+        """Run `compute` once per key across concurrent callers, caching its result if `store`
+        
+        Callers have already missed the cache. The leader peeks at the local
+        tier once more (uncounted, no Redis round trip), so a caller that
+        missed just before an identical computation finished doesn't start
+        a new one.
+        """
+        if key is None:
+            return compute()
+        
+        def lead():
+            if self.cache is not None:
+                missing = object()
+                value = self.cache.peek(key, missing)
+                if value is not missing:
+                    return value
+            value = compute()
+            if store and self.cache is not None:
+                self.cache.put(key, value)
+            return value
+        
+        return self._flights.do(key, lead)
+    
+    def _cache_key(self, namespace: str, inputs: Dict[str, Any]) -> Optional[str]:
+        """Cache and coalescing key of a computation, or None when it must not be shared
+        
+        Results that a rerun would not reproduce (a Monte Carlo seed of None,
+        a time budget) are never shared.
+        """
+        if not self._reproducible(inputs):
+            return None
+        return canonical_key(namespace, inputs)
+    
+    def _reproducible(self, inputs: Dict[str, Any]) -> bool:
+        for key, value in inputs.items():
+            if isinstance(value, dict) and not self._reproducible(value):
+                return False
+            if (key == "seed" and value is None) or (key == "max_time_ms" and value is not None):
+                return False
+        return True
     
     def get_model_comparison_metrics(self, results: List[PricingResult]) -> Dict[str, Any]:
         """Calculate comparison metrics across models"""
@@ -1,13 +1,13 @@
 import math
-from scipy.stats import norm
 from typing import Dict
 from .base_model import BasePricingModel, OptionParameters, PricingResult
+from .numerics import norm_cdf, norm_pdf
 
 class BlackScholesModel(BasePricingModel):
     
     def calculate(self, params: OptionParameters, **kwargs) -> PricingResult:
         """Calculate Black-Scholes option price and Greeks"""
-        price, greeks, computation_time = self._time_calculation(
+        (price, greeks), computation_time = self._time_calculation(
             self._calculate_price_and_greeks, params
         )
         
@@ -20,7 +20,7 @@ class BlackScholesModel(BasePricingModel):
     
     def calculate_greeks(self, params: OptionParameters, **kwargs) -> Dict[str, float]:
         """Calculate only the Greeks (faster when price not needed)"""
-        _, greeks, _ = self._calculate_price_and_greeks(params)
+        _, greeks = self._calculate_price_and_greeks(params)
         return greeks
     
     def _calculate_price_and_greeks(self, params: OptionParameters):
@@ -38,11 +38,11 @@ class BlackScholesModel(BasePricingModel):
         
         # Calculate option price
         if params.option_type.lower() == "call":
-            price = (S * math.exp(-q * T) * norm.cdf(d1) - 
-                    K * math.exp(-r * T) * norm.cdf(d2))
+            price = (S * math.exp(-q * T) * norm_cdf(d1) - 
+                    K * math.exp(-r * T) * norm_cdf(d2))
         else:  # put
-            price = (K * math.exp(-r * T) * norm.cdf(-d2) - 
-                    S * math.exp(-q * T) * norm.cdf(-d1))
+            price = (K * math.exp(-r * T) * norm_cdf(-d2) - 
+                    S * math.exp(-q * T) * norm_cdf(-d1))
         
         # Calculate Greeks
         greeks = self._calculate_greeks_analytical(params, d1, d2)
@@ -59,9 +59,9 @@ class BlackScholesModel(BasePricingModel):
         sigma = params.volatility
         
         # Common calculations
-        nd1 = norm.cdf(d1)
-        nd2 = norm.cdf(d2)
-        pdf_d1 = norm.pdf(d1)
+        nd1 = norm_cdf(d1)
+        nd2 = norm_cdf(d2)
+        pdf_d1 = norm_pdf(d1)
         
         if params.option_type.lower() == "call":
             delta = math.exp(-q * T) * nd1
@@ -70,11 +70,11 @@ class BlackScholesModel(BasePricingModel):
                     q * S * math.exp(-q * T) * nd1)
             rho = K * T * math.exp(-r * T) * nd2 / 100
         else:  # put
-            delta = -math.exp(-q * T) * norm.cdf(-d1)
+            delta = -math.exp(-q * T) * norm_cdf(-d1)
             theta = ((-S * pdf_d1 * sigma * math.exp(-q * T)) / (2 * math.sqrt(T)) +
-                    r * K * math.exp(-r * T) * norm.cdf(-d2) -
-                    q * S * math.exp(-q * T) * norm.cdf(-d1))
-            rho = -K * T * math.exp(-r * T) * norm.cdf(-d2) / 100
+                    r * K * math.exp(-r * T) * norm_cdf(-d2) -
+                    q * S * math.exp(-q * T) * norm_cdf(-d1))
+            rho = -K * T * math.exp(-r * T) * norm_cdf(-d2) / 100
         
         # Gamma and Vega are the same for calls and puts
         gamma = (pdf_d1 * math.exp(-q * T)) / (S * sigma * math.sqrt(T))
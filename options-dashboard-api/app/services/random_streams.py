@@ -0,0 +1,139 @@
+import numpy as np
+from collections import deque
+from scipy.special import ndtri
+from scipy.stats import qmc
+from typing import List, Optional, Sequence
+
+# Explicit random streams for the simulation models.
+#
+# Every pricing request builds its own np.random.Generator from a
+# SeedSequence instead of touching NumPy's global RandomState, so concurrent
+# requests never share state and a given seed always reproduces the same
+# numbers. Independent parallel streams are spawned from the same
+# SeedSequence, which guarantees they do not overlap.
+#
+# Quasi-random (Sobol) normals are randomized with independent scrambles so
+# the spread between replicates gives an honest error estimate.
+
+BIT_GENERATORS = {
+    "pcg64": np.random.PCG64,
+    "philox": np.random.Philox,
+}
+
+SAMPLERS = ("pseudo", "sobol")
+
+
+def seed_sequence(seed: Optional[int]) -> np.random.SeedSequence:
+    """Root SeedSequence for a request (None draws fresh OS entropy)"""
+    return np.random.SeedSequence(seed)
+
+
+def make_generator(seed, bit_generator: str = "pcg64") -> np.random.Generator:
+    """Generator for an integer seed or an existing SeedSequence"""
+    if bit_generator not in BIT_GENERATORS:
+        raise ValueError(f"Bit generator must be one of {tuple(BIT_GENERATORS)}, got '{bit_generator}'")
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = seed_sequence(seed)
+    return np.random.Generator(BIT_GENERATORS[bit_generator](seed))
+
+
+def spawn_generators(seed, n_streams: int, bit_generator: str = "pcg64") -> List[np.random.Generator]:
+    """Independent, reproducible child streams for parallel work"""
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = seed_sequence(seed)
+    return [make_generator(child, bit_generator) for child in seed.spawn(n_streams)]
+
+
+def child_sequence(root: np.random.SeedSequence, index: int) -> np.random.SeedSequence:
+    """The index-th child of `root`, without advancing root's spawn counter
+
+    Equivalent to root.spawn(index + 1)[index] on a fresh SeedSequence, but
+    stateless, so every worker derives the same child for the same index.
+    """
+    return np.random.SeedSequence(
+        entropy=root.entropy, spawn_key=root.spawn_key + (index,), pool_size=root.pool_size
+    )
+
+
+def block_generator(root: np.random.SeedSequence, block: int, bit_generator: str = "pcg64") -> np.random.Generator:
+    """Generator for one fixed-size block of a simulation
+
+    The stream depends only on the seed and the block index, so any
+    chunking or split across workers draws exactly the same numbers.
+    """
+    return make_generator(child_sequence(root, block), bit_generator)
+
+
+class SobolNormals:
+    """Standard normals from independently scrambled Sobol sequences
+
+    Each replicate gets its own scramble from a child SeedSequence, and the
+    uniforms are mapped through the inverse normal CDF. Successive draws
+    continue the sequences, so a run can be consumed in chunks; chunk sizes
+    should be powers of two to keep every chunk a balanced Sobol net.
+    """
+
+    def __init__(self, seed, dimensions: int, replicates: int):
+        if not isinstance(seed, np.random.SeedSequence):
+            seed = seed_sequence(seed)
+        self.dimensions = dimensions
+        self.replicates = replicates
+        self._engines = [
+            qmc.Sobol(dimensions, scramble=True, seed=make_generator(child_sequence(seed, replicate)))
+            for replicate in range(replicates)
+        ]
+
+    def fast_forward(self, n_points: int):
+        """Skip the next n_points of every replicate"""
+        if n_points == 0:
+            return
+        for engine in self._engines:
+            engine.fast_forward(n_points)
+
+    def draw(self, n_points: int) -> np.ndarray:
+        """Next n_points of every replicate, shape (replicates, n_points, dimensions)"""
+        normals = np.empty((self.replicates, n_points, self.dimensions))
+        for replicate, engine in enumerate(self._engines):
+            uniforms = engine.random(n_points)
+            # Scrambled points never hit 0 or 1 exactly, but keep the transform finite
+            normals[replicate] = ndtri(np.clip(uniforms, 1e-16, 1 - 1e-16))
+        return normals
+
+
+def brownian_bridge(z: np.ndarray, times: Sequence[float]) -> np.ndarray:
+    """Brownian motion levels W(t_1..t_m) built from standard normals by bisection
+
+    z[..., 0] fixes the terminal value, and each further column fills the
+    midpoint of the widest remaining interval. With low-discrepancy input the
+    first (best distributed) dimensions therefore drive the coarse shape of
+    the path, which is what makes QMC effective on multi-step paths.
+    """
+    times = np.asarray(times, dtype=np.float64)
+    steps = times.size
+    if z.shape[-1] != steps:
+        raise ValueError(f"Need one normal per time step ({steps}), got {z.shape[-1]}")
+
+    levels = np.empty(z.shape)
+    levels[..., -1] = np.sqrt(times[-1]) * z[..., 0]
+
+    # Breadth-first bisection; index -1 stands for W(0) = 0
+    column = 1
+    intervals = deque([(-1, steps - 1)])
+    while intervals:
+        left, right = intervals.popleft()
+        if right - left < 2:
+            continue
+        middle = (left + right) // 2
+        t_left = times[left] if left >= 0 else 0.0
+        w_left = levels[..., left] if left >= 0 else 0.0
+        t_mid, t_right = times[middle], times[right]
+
+        weight = (t_mid - t_left) / (t_right - t_left)
+        std = np.sqrt((t_mid - t_left) * (t_right - t_mid) / (t_right - t_left))
+        levels[..., middle] = w_left + weight * (levels[..., right] - w_left) + std * z[..., column]
+
+        column += 1
+        intervals.append((left, middle))
+        intervals.append((middle, right))
+
+    return levels
@@ -0,0 +1,128 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, Optional
+from fastapi import HTTPException
+from app.config import settings
+
+POOL_KINDS = ("thread", "process")
+
+
+class PoolSaturated(HTTPException):
+    """Raised when the pricing pool and its queue are full (rendered as 503 + Retry-After)"""
+    
+    def __init__(self, retry_after: int):
+        super().__init__(
+            status_code=503,
+            detail="Pricing workers are busy, retry shortly",
+            headers={"Retry-After": str(retry_after)}
+        )
+
+
+def _call_engine(method: str, *args, **kwargs):
+    """Run a PricingEngine method in the worker (module level so process pools can pickle it)"""
+    from app.services.pricing_engine import pricing_engine
+    return getattr(pricing_engine, method)(*args, **kwargs)
+
+
+class WorkerPool:
+    """Size-limited pool that keeps CPU-bound pricing off the event loop
+    
+    At most `max_workers` jobs run at once and `max_queue` more may wait;
+    further submissions are rejected straight away with PoolSaturated
+    instead of piling up behind slow requests. A job counts against the
+    limit until it actually finishes, even if the request awaiting it is
+    cancelled (client disconnect, ASGI timeout), so dropped connections
+    cannot push more work in than the pool admits.
+    """
+    
+    def __init__(self, kind: str = "thread", max_workers: int = 4, max_queue: int = 16,
+                 retry_after: int = 1):
+        if kind not in POOL_KINDS:
+            raise ValueError(f"Worker pool kind must be one of {POOL_KINDS}, got '{kind}'")
+        if max_workers < 1 or max_queue < 0:
+            raise ValueError("Worker pool needs at least one worker and a non-negative queue")
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+        self._executor: Optional[Executor] = None
+        # Jobs finish on worker threads, so the counters are locked
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.rejected = 0
+    
+    @property
+    def queue_depth(self) -> int:
+        """Jobs admitted but still waiting for a worker"""
+        return max(self.in_flight - self.max_workers, 0)
+    
+    async def run(self, func, *args, **kwargs) -> Any:
+        """Run `func(*args, **kwargs)` on the pool, or raise PoolSaturated when full"""
+        with self._lock:
+            if self.in_flight >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise PoolSaturated(self.retry_after)
+            self.in_flight += 1
+        
+        try:
+            future = self._get_executor().submit(functools.partial(func, *args, **kwargs))
+        except BaseException:
+            with self._lock:
+                self.in_flight -= 1
+            raise
+        future.add_done_callback(self._job_done)
+        # Cancelling the caller only cancels a job that has not started yet
+        return await asyncio.wrap_future(future)
+    
+    async def run_engine(self, method: str, *args, **kwargs) -> Any:
+        """Run a method of the worker's PricingEngine on the pool"""
+        return await self.run(_call_engine, method, *args, **kwargs)
+    
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "running": min(self.in_flight, self.max_workers),
+            "queue_depth": self.queue_depth,
+            "completed": self.completed,
+            "failed": self.failed,
+            "cancelled": self.cancelled,
+            "rejected": self.rejected
+        }
+    
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+    
+    def _job_done(self, future: Future):
+        with self._lock:
+            self.in_flight -= 1
+            if future.cancelled():
+                self.cancelled += 1
+            elif future.exception() is not None:
+                self.failed += 1
+            else:
+                self.completed += 1
+    
+    def _get_executor(self) -> Executor:
+        # Created on first use so importing the app never spawns workers
+        if self._executor is None:
+            pool = ThreadPoolExecutor if self.kind == "thread" else ProcessPoolExecutor
+            self._executor = pool(max_workers=self.max_workers)
+        return self._executor
+
+
+# Create global instance
+worker_pool = WorkerPool(
+    kind=settings.PRICING_POOL_KIND,
+    max_workers=settings.PRICING_POOL_WORKERS,
+    max_queue=settings.PRICING_POOL_QUEUE_SIZE,
+    retry_after=settings.PRICING_POOL_RETRY_AFTER_SECONDS
+)
\ No newline at end of file
@@ -0,0 +1,73 @@
+"""Microbenchmark for the scalar normal CDF/PDF kernels
+
+Compares scipy.stats.norm against the helpers in app.services.numerics, both
+per call and for a full single-contract Black-Scholes price + Greeks.
+
+Run from the options-dashboard-api directory:
+    python -m benchmarks.normal_kernels
+"""
+import math
+import timeit
+from scipy.stats import norm
+from app.services.base_model import OptionParameters
+from app.services.black_scholes import BlackScholesModel
+from app.services.numerics import norm_cdf, norm_pdf
+
+
+def _scipy_price_and_greeks(params: OptionParameters):
+    """Reference Black-Scholes using scipy.stats.norm (the previous implementation)"""
+    S = params.spot_price
+    K = params.strike_price
+    T = params.time_to_expiry
+    r = params.risk_free_rate
+    q = params.dividend_yield
+    sigma = params.volatility
+
+    d1 = (math.log(S / K) + (r - q + 0.5 * sigma**2) * T) / (sigma * math.sqrt(T))
+    d2 = d1 - sigma * math.sqrt(T)
+
+    price = S * math.exp(-q * T) * norm.cdf(d1) - K * math.exp(-r * T) * norm.cdf(d2)
+    delta = math.exp(-q * T) * norm.cdf(d1)
+    theta = ((-S * norm.pdf(d1) * sigma * math.exp(-q * T)) / (2 * math.sqrt(T)) -
+             r * K * math.exp(-r * T) * norm.cdf(d2) +
+             q * S * math.exp(-q * T) * norm.cdf(d1))
+    gamma = (norm.pdf(d1) * math.exp(-q * T)) / (S * sigma * math.sqrt(T))
+    vega = S * math.exp(-q * T) * norm.pdf(d1) * math.sqrt(T) / 100
+    rho = K * T * math.exp(-r * T) * norm.cdf(d2) / 100
+    return price, (delta, gamma, theta, vega, rho)
+
+
+def _per_call_us(stmt, number: int) -> float:
+    """Best-of-5 latency of `stmt` in microseconds per call"""
+    return min(timeit.repeat(stmt, number=number, repeat=5)) / number * 1e6
+
+
+def main():
+    x = 0.3456
+    params = OptionParameters(
+        spot_price=100.0,
+        strike_price=105.0,
+        time_to_expiry=0.5,
+        risk_free_rate=0.05,
+        volatility=0.2,
+        dividend_yield=0.01,
+        option_type="call"
+    )
+    model = BlackScholesModel()
+
+    rows = [
+        ("norm CDF", lambda: norm.cdf(x), lambda: norm_cdf(x), 20000),
+        ("norm PDF", lambda: norm.pdf(x), lambda: norm_pdf(x), 20000),
+        ("BS price + Greeks", lambda: _scipy_price_and_greeks(params),
+         lambda: model._calculate_price_and_greeks(params), 5000),
+    ]
+
+    print(f"{'kernel':<20}{'scipy.stats (us)':>18}{'numerics (us)':>16}{'speedup':>10}")
+    for name, before, after, number in rows:
+        before_us = _per_call_us(before, number)
+        after_us = _per_call_us(after, number)
+        print(f"{name:<20}{before_us:>18.3f}{after_us:>16.3f}{before_us / after_us:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
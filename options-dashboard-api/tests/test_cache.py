@@ -0,0 +1,179 @@
+import time
+import numpy as np
+import pytest
+from app.services.base_model import OptionParameters
+from app.services.cache import (
+    PricingCache, RedisCache, TieredCache, canonical_key, decode_value, encode_value, quantize_params
+)
+from app.services.pricing_engine import PricingEngine
+
+
+def test_lru_evicts_least_recently_used_entry():
+    cache = PricingCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+    
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert cache.stats()["evictions"] == 1
+
+
+def test_byte_bound_evicts_and_skips_oversized_entries():
+    cache = PricingCache(max_bytes=12_000)
+    cache.put("a", np.zeros(1000))
+    cache.put("b", np.zeros(1000))
+    cache.put("c", np.zeros(10_000))
+    
+    assert cache.get("a") is None
+    assert cache.get("b") is not None
+    assert cache.get("c") is None
+    assert cache.stats()["bytes"] <= 12_000
+
+
+def test_entries_expire_after_ttl():
+    cache = PricingCache(ttl_seconds=0.05)
+    cache.put("a", 1)
+    assert cache.get("a") == 1
+    
+    time.sleep(0.06)
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_non_positive_ttl_is_rejected():
+    with pytest.raises(ValueError):
+        PricingCache(ttl_seconds=0)
+
+
+def test_quantized_params_share_a_key():
+    near = OptionParameters(100.0004, 100, 1, 0.05, 0.20001)
+    far = OptionParameters(100.4, 100, 1, 0.05, 0.2)
+    exact = OptionParameters(100, 100, 1, 0.05, 0.2)
+    
+    def key(params, digits):
+        return canonical_key("black_scholes", {"params": quantize_params(params, digits)})
+    
+    assert key(near, 4) == key(exact, 4)
+    assert key(far, 4) != key(exact, 4)
+    assert key(near, None) != key(exact, None)
+
+
+def test_unseeded_and_time_budgeted_runs_are_never_cached():
+    engine = PricingEngine(cache=PricingCache())
+    params = OptionParameters(100, 100, 1, 0.05, 0.2)
+    
+    engine.calculate_single_model("monte_carlo", params, simulations=2000, seed=None)
+    engine.calculate_single_model("monte_carlo", params, simulations=2000, max_time_ms=50)
+    assert engine.cache_stats()["entries"] == 0
+    
+    engine.calculate_single_model("monte_carlo", params, simulations=2000, seed=7)
+    engine.calculate_single_model("monte_carlo", params, simulations=2000, seed=7)
+    assert engine.cache_stats()["entries"] == 1
+    assert engine.cache_stats()["hits"] == 1
+
+
+class FakeRedis:
+    """In-memory stand-in for the redis-py calls the L2 tier makes"""
+    
+    def __init__(self, fail: bool = False):
+        self.data = {}
+        self.calls = 0
+        self.fail = fail
+    
+    def mget(self, keys):
+        self._call()
+        return [self.data.get(key) for key in keys]
+    
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+    
+    def _call(self):
+        self.calls += 1
+        if self.fail:
+            raise ConnectionError("Connection refused")
+
+
+class _FakePipeline:
+    def __init__(self, client: FakeRedis):
+        self.client = client
+        self.commands = []
+    
+    def set(self, key, value, px=None):
+        self.commands.append((key, value))
+    
+    def execute(self):
+        self.client._call()
+        self.client.data.update(self.commands)
+
+
+def _assert_same(a, b):
+    if isinstance(a, np.ndarray):
+        assert isinstance(b, np.ndarray) and a.dtype == b.dtype and np.array_equal(a, b)
+    elif isinstance(a, dict):
+        assert a.keys() == b.keys()
+        for key in a:
+            _assert_same(a[key], b[key])
+    elif isinstance(a, (list, tuple)):
+        assert len(a) == len(b)
+        for x, y in zip(a, b):
+            _assert_same(x, y)
+    elif hasattr(a, "__dict__"):
+        assert type(a) is type(b)
+        _assert_same(vars(a), vars(b))
+    else:
+        assert a == b or (a != a and b != b)
+
+
+def test_codec_round_trips_pricing_results():
+    engine = PricingEngine(cache=None)
+    params = OptionParameters(36, 40, 1, 0.06, 0.2, option_type="put")
+    values = [
+        engine.calculate_single_model("binomial", params, exercise="american"),
+        engine.calculate_chain("binomial", params, [36, 40, 44], exercise="american"),
+        engine.calculate_chain("monte_carlo", params, [36, 40, 44], simulations=4000),
+        engine.calculate_batch("black_scholes", 36, np.linspace(30, 50, 5)[:, None], [0.5, 1.0], 0.06, 0.2),
+        engine.calculate_path_dependent(params, [{"type": "asian"}, {"type": "lookback"}],
+                                        time_steps=12, simulations=4000),
+    ]
+    assert values[0].exercise_boundary
+    
+    for value in values:
+        _assert_same(value, decode_value(encode_value(value)))
+
+
+def test_second_engine_hits_shared_redis_tier():
+    redis = FakeRedis()
+    params = OptionParameters(100, 100, 1, 0.05, 0.2)
+    first = PricingEngine(cache=TieredCache(PricingCache(), RedisCache(redis)))
+    results, _ = first.calculate_all_models(params, monte_carlo_options={"seed": 1})
+    
+    second = PricingEngine(cache=TieredCache(PricingCache(), RedisCache(redis)))
+    calls = redis.calls
+    cached, failures = second.calculate_all_models(params, monte_carlo_options={"seed": 1})
+    
+    assert not failures
+    assert redis.calls == calls + 1  # a single MGET for all models
+    assert second.cache_stats()["l2"]["hits"] == 3
+    _assert_same(results, cached)
+
+
+def test_redis_errors_bypass_the_tier_for_the_retry_window():
+    redis = FakeRedis(fail=True)
+    l2 = RedisCache(redis, retry_seconds=0.05)
+    cache = TieredCache(PricingCache(), l2)
+    
+    assert cache.get_or_compute("a", lambda: 1) == 1
+    assert (redis.calls, l2.available) == (1, False)
+    
+    # Inside the window Redis is not contacted; the local tier still serves
+    assert cache.get_or_compute("b", lambda: 2) == 2
+    assert cache.get("a") == 1
+    assert redis.calls == 1
+    assert l2.stats()["bypassed"] >= 1
+    
+    time.sleep(0.06)
+    redis.fail = False
+    assert cache.get_or_compute("c", lambda: 3) == 3
+    assert l2.available and "pricing:v1:c" in redis.data
@@ -0,0 +1,64 @@
+import threading
+import time
+from app.services.base_model import OptionParameters
+from app.services.cache import PricingCache, SingleFlight
+from app.services.pricing_engine import PricingEngine
+
+
+def _run_concurrently(n, target):
+    start = threading.Barrier(n)
+    results = [None] * n
+    
+    def worker(i):
+        start.wait()
+        try:
+            results[i] = target()
+        except Exception as e:
+            results[i] = e
+    
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(n)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_identical_concurrent_requests_share_one_computation(monkeypatch):
+    engine = PricingEngine(cache=PricingCache())
+    model = engine.models["monte_carlo"]
+    calculate = model.calculate
+    calls = []
+    
+    def slow_calculate(*args, **kwargs):
+        calls.append(1)
+        time.sleep(0.2)
+        return calculate(*args, **kwargs)
+    
+    monkeypatch.setattr(model, "calculate", slow_calculate)
+    params = OptionParameters(100, 100, 1, 0.05, 0.2)
+    
+    results = _run_concurrently(6, lambda: engine.calculate_single_model(
+        "monte_carlo", params, simulations=5000, seed=11
+    ))
+    
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert engine.coalescing_stats() == {"in_flight": 0, "computations": 1, "computations_saved": 5}
+
+
+def test_leader_exception_reaches_followers_and_releases_key():
+    flights = SingleFlight()
+    
+    def failing():
+        time.sleep(0.2)
+        raise ValueError("model failed")
+    
+    results = _run_concurrently(4, lambda: flights.do("key", failing))
+    
+    assert all(isinstance(result, ValueError) for result in results)
+    assert flights.stats() == {"in_flight": 0, "computations": 1, "computations_saved": 3}
+    
+    # The key is free again: the next call computes afresh
+    assert flights.do("key", lambda: 42) == 42
+    assert flights.stats()["computations"] == 2
@@ -0,0 +1,29 @@
+import numpy as np
+from app.services.black_scholes import BlackScholesModel
+from app.services.implied_vol import CONVERGED, OUT_OF_RANGE, ImpliedVolatilitySolver
+
+
+def _quote(S, K, T, r, vol, is_call):
+    model = BlackScholesModel()
+    return float(model.price_batch(*(np.asarray(x, dtype=np.float64) for x in (S, K, T, r, 0.0, vol)),
+                                   np.asarray(is_call))["price"])
+
+
+def test_vol_above_search_interval_is_out_of_range():
+    solver = ImpliedVolatilitySolver()
+    prices = [_quote(100, 100, 1, 0.03, vol, True) for vol in (6.0, 8.0)]
+    
+    result = solver.solve(prices, 100, 100, 1, 0.03, 0.0, True)
+    
+    assert list(result["status"]) == [OUT_OF_RANGE, OUT_OF_RANGE]
+    assert np.isnan(result["implied_volatility"]).all()
+
+
+def test_deep_out_of_the_money_put_recovers_vol():
+    solver = ImpliedVolatilitySolver()
+    price = _quote(100, 50, 1, 0.03, 0.1, False)
+    
+    result = solver.solve(price, 100, 50, 1, 0.03, 0.0, False)
+    
+    assert result["status"] == CONVERGED
+    assert abs(result["implied_volatility"] - 0.1) < 1e-6
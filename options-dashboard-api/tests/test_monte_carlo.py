@@ -0,0 +1,16 @@
+import math
+from app.services.base_model import OptionParameters
+from app.services.monte_carlo import MonteCarloModel
+
+
+def test_single_payoff_path_dependent_sobol():
+    model = MonteCarloModel()
+    params = OptionParameters(100, 100, 1, 0.05, 0.2)
+    
+    result = model.calculate_path_dependent(
+        params, [{"type": "asian"}], time_steps=50, simulations=10000, sampler="sobol"
+    )
+    
+    asian = result["payoffs"]["asian_arithmetic"]
+    assert math.isfinite(asian["price"]) and asian["price"] > 0
+    assert asian["standard_error"] > 0
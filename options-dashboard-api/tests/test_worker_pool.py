@@ -0,0 +1,67 @@
+import asyncio
+import threading
+import time
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.utils.worker_pool import PoolSaturated, WorkerPool
+
+
+def test_saturated_pool_returns_503_with_retry_after():
+    pool = WorkerPool(max_workers=1, max_queue=0, retry_after=7)
+    release = threading.Event()
+    app = FastAPI()
+    
+    @app.get("/slow")
+    async def slow():
+        await pool.run(release.wait, 5)
+        return {"ok": True}
+    
+    with TestClient(app) as client:
+        first = threading.Thread(target=client.get, args=("/slow",))
+        first.start()
+        while pool.in_flight == 0:
+            time.sleep(0.01)
+        
+        response = client.get("/slow")
+        release.set()
+        first.join()
+    
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "7"
+    assert pool.metrics()["rejected"] == 1
+    pool.shutdown()
+
+
+def test_cancelled_caller_keeps_running_job_admitted():
+    async def scenario():
+        pool = WorkerPool(max_workers=1, max_queue=1)
+        release = threading.Event()
+        running = asyncio.ensure_future(pool.run(release.wait, 5))
+        queued = asyncio.ensure_future(pool.run(release.wait, 5))
+        await asyncio.sleep(0.05)
+        
+        # The running job still occupies its worker after its caller goes away;
+        # the queued one never started, so it is cancelled and released
+        running.cancel()
+        queued.cancel()
+        await asyncio.sleep(0.05)
+        assert pool.in_flight == 1
+        assert pool.metrics()["cancelled"] == 1
+        
+        release.set()
+        while pool.in_flight:
+            await asyncio.sleep(0.01)
+        
+        def boom():
+            raise ValueError("bad input")
+        
+        with pytest.raises(ValueError):
+            await pool.run(boom)
+        await asyncio.sleep(0.01)
+        metrics = pool.metrics()
+        pool.shutdown()
+        return metrics
+    
+    metrics = asyncio.run(scenario())
+    assert (metrics["completed"], metrics["failed"], metrics["cancelled"]) == (1, 1, 1)